@@ -0,0 +1,40 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+
+def token_cache_key(key):
+    return 'token:{}'.format(hashlib.sha256(key.encode()).hexdigest())
+
+
+def build_instance(model, values):
+    return model.from_db(router.db_for_read(model), list(values),
+                         list(values.values()))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        snapshot = cache.get(cache_key)
+        if snapshot is None:
+            user, token = super().authenticate_credentials(key)
+            cache.set(cache_key, (user.pk, user.is_active),
+                      settings.AUTH_TOKEN_CACHE_TIMEOUT)
+            return user, token
+        user_id, is_active = snapshot
+        if not is_active:
+            raise exceptions.AuthenticationFailed(
+                _('User inactive or deleted.')
+            )
+        user = build_instance(get_user_model(),
+                              {'id': user_id, 'is_active': is_active})
+        token = build_instance(self.get_model(),
+                               {'key': key, 'user_id': user_id})
+        token.user = user
+        return user, token
@@ -0,0 +1,117 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.views.decorators.http import condition
+from rest_framework.response import Response
+
+GENERATION_KEY = 'generation:{}'
+
+
+def get_generation(name):
+    key = GENERATION_KEY.format(name)
+    generation = cache.get(key)
+    if generation is None:
+        generation = time.time_ns()
+        if not cache.add(key, generation, None):
+            generation = cache.get(key, generation)
+    return generation
+
+
+def bump_generation(*names):
+    generation = time.time_ns()
+    cache.set_many(
+        {GENERATION_KEY.format(name): generation for name in names}, None
+    )
+
+
+def user_generation(user_id):
+    return f'user:{user_id}'
+
+
+def make_cache_key(prefix, request, params=()):
+    query = urlencode(sorted(
+        (param, value) for param in params
+        for value in request.query_params.getlist(param)
+    ))
+    raw_key = f'{request.get_host()}{request.path}?{query}'
+    return '{}:{}:{}'.format(
+        prefix, get_generation(prefix),
+        hashlib.md5(raw_key.encode()).hexdigest()
+    )
+
+
+class AnonymousCacheMixin:
+    cache_generation = None
+    cache_query_params = ()
+
+    def get_cache_key(self, request):
+        return make_cache_key(self.cache_generation, request,
+                              self.cache_query_params)
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return handler(request, *args, **kwargs)
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.API_CACHE_TIMEOUT)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(super().list, request,
+                                        *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(super().retrieve, request,
+                                        *args, **kwargs)
+
+
+class ConditionalGetMixin:
+    condition_generations = ()
+    condition_per_user = False
+
+    def get_condition_generations(self, request):
+        generations = [get_generation(name)
+                       for name in self.condition_generations]
+        if self.condition_per_user and request.user.is_authenticated:
+            generations.append(
+                get_generation(user_generation(request.user.pk))
+            )
+        return generations
+
+    def get_etag(self, request, *args, **kwargs):
+        user = (request.user.pk if self.condition_per_user
+                and request.user.is_authenticated else None)
+        raw_etag = '{}:{}?{}:{}:{}'.format(
+            request.accepted_renderer.format, request.path,
+            urlencode(sorted(request.query_params.lists()), doseq=True),
+            user, self.get_condition_generations(request)
+        )
+        return hashlib.md5(raw_etag.encode()).hexdigest()
+
+    def get_last_modified(self, request, *args, **kwargs):
+        return datetime.fromtimestamp(
+            max(self.get_condition_generations(request)) / 10 ** 9,
+            tz=timezone.utc
+        )
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        return condition(
+            etag_func=self.get_etag,
+            last_modified_func=self.get_last_modified
+        )(handler)(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(super().list, request,
+                                             *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(super().retrieve, request,
+                                             *args, **kwargs)
@@ -4,3 +4,12 @@ MAX_LENGTH_INPUT_EMAIL = 254
 MAX_LENGTH_INPUT_NAME = 200
 MAX_VALUE = 32767
 MIN_VALUE = 1
+SHOPPING_CART_CHUNK_SIZE = 500
+POPULARITY_HALF_LIFE = 7 * 24 * 60 * 60
+MIN_POPULARITY_EXPONENT = -1000
+IMAGE_VARIANTS = {
+    'thumbnail': (160, 160),
+    'card': (600, 600),
+    'full': (1600, 1600),
+}
+IMAGE_QUALITY = 82
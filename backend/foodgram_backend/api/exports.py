@@ -0,0 +1,127 @@
+import csv
+import json
+import logging
+from tempfile import SpooledTemporaryFile
+
+from django.conf import settings
+from rest_framework import renderers
+
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFError, TTFont
+    from reportlab.pdfgen.canvas import Canvas
+except ImportError:
+    Canvas = None
+
+SHOPPING_CART_TITLE = 'Список покупок:'
+PDF_FONT_NAME = 'ShoppingCart'
+
+logger = logging.getLogger(__name__)
+
+
+class ShoppingCartRenderer(renderers.BaseRenderer):
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return renderers.JSONRenderer().render(data)
+
+
+class TxtRenderer(ShoppingCartRenderer):
+    media_type = 'application/txt'
+    format = 'txt'
+
+
+class CsvRenderer(ShoppingCartRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class JsonRenderer(ShoppingCartRenderer):
+    media_type = 'application/json'
+    format = 'json'
+
+
+class PdfRenderer(ShoppingCartRenderer):
+    media_type = 'application/pdf'
+    format = 'pdf'
+    charset = None
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def shopping_cart_txt(ingredients):
+    yield f'{SHOPPING_CART_TITLE}\n'
+    for name, measurement_unit, amount in ingredients:
+        yield f'{name} - {amount} {measurement_unit}\n'
+
+
+def shopping_cart_csv(ingredients):
+    writer = csv.writer(Echo())
+    yield writer.writerow(('name', 'amount', 'measurement_unit'))
+    for name, measurement_unit, amount in ingredients:
+        yield writer.writerow((name, amount, measurement_unit))
+
+
+def shopping_cart_json(ingredients):
+    separator = '['
+    for name, measurement_unit, amount in ingredients:
+        yield separator + json.dumps(
+            {'name': name, 'amount': amount,
+             'measurement_unit': measurement_unit},
+            ensure_ascii=False
+        )
+        separator = ','
+    yield '[]' if separator == '[' else ']'
+
+
+def register_pdf_font():
+    if Canvas is None:
+        return False
+    if PDF_FONT_NAME not in pdfmetrics.getRegisteredFontNames():
+        try:
+            pdfmetrics.registerFont(
+                TTFont(PDF_FONT_NAME, settings.PDF_FONT_PATH)
+            )
+        except (TTFError, OSError):
+            logger.warning('PDF shopping cart export is disabled: '
+                           'cannot load font %s', settings.PDF_FONT_PATH)
+            return False
+    return True
+
+
+def shopping_cart_pdf(ingredients):
+    width, height = A4
+    margin, line_height = 50, 18
+    file = SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE)
+    pdf = Canvas(file, pagesize=A4)
+    pdf.setTitle(SHOPPING_CART_TITLE.rstrip(':'))
+    pdf.setFont(PDF_FONT_NAME, 16)
+    pdf.drawString(margin, height - margin, SHOPPING_CART_TITLE)
+    y = height - margin - 2 * line_height
+    pdf.setFont(PDF_FONT_NAME, 12)
+    for name, measurement_unit, amount in ingredients:
+        if y < margin:
+            pdf.showPage()
+            pdf.setFont(PDF_FONT_NAME, 12)
+            y = height - margin
+        pdf.drawString(margin, y, f'{name} - {amount} {measurement_unit}')
+        y -= line_height
+    pdf.save()
+    file.seek(0)
+    return file
+
+
+SHOPPING_CART_EXPORTS = {
+    'txt': shopping_cart_txt,
+    'csv': shopping_cart_csv,
+    'json': shopping_cart_json,
+    'pdf': shopping_cart_pdf,
+}
+
+SHOPPING_CART_RENDERERS = (TxtRenderer, CsvRenderer, JsonRenderer)
+if register_pdf_font():
+    SHOPPING_CART_RENDERERS += (PdfRenderer,)
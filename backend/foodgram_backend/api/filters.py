@@ -1,19 +1,41 @@
-from django_filters import FilterSet, ModelMultipleChoiceFilter, NumberFilter
+from django.db.models import Exists, OuterRef
+from django_filters import (ChoiceFilter, FilterSet, MultipleChoiceFilter,
+                            NumberFilter)
 
-from recipes.models import Recipe, Tag
+from .references import tag_cache
+from recipes.models import Recipe
+
+ORDERINGS = {
+    'new': ('-pub_date',),
+    'popular': ('-popularity', '-pub_date'),
+    'quick': ('cooking_time', '-pub_date'),
+}
 
 
 class RecipeFilter(FilterSet):
-    tags = ModelMultipleChoiceFilter(queryset=Tag.objects.all(),
-                                     field_name='tags__slug',
-                                     to_field_name='slug',)
+    tags = MultipleChoiceFilter(
+        choices=lambda: [
+            (slug, slug) for slug in tag_cache.get_lookup('slug')
+        ],
+        method='filter_tags'
+    )
     is_favorited = NumberFilter(method='filter_is_favorited')
     is_in_shopping_cart = NumberFilter(method='filter_is_in_shopping_cart')
+    ordering = ChoiceFilter(choices=[(value, value) for value in ORDERINGS],
+                            method='filter_ordering')
 
     class Meta:
         model = Recipe
         fields = ('author',)
 
+    def filter_tags(self, queryset, name, value):
+        tag_lookup = tag_cache.get_lookup('slug')
+        return queryset.filter(Exists(Recipe.tags.through.objects.filter(
+            recipe=OuterRef('pk'),
+            tag_id__in=[tag_lookup[slug].id for slug in value
+                        if slug in tag_lookup]
+        )))
+
     def filter_is_favorited(self, queryset, name, value):
         if value and self.request.user.is_authenticated:
             return queryset.filter(is_fav__user=self.request.user)
@@ -23,3 +45,6 @@ class RecipeFilter(FilterSet):
         if value and self.request.user.is_authenticated:
             return queryset.filter(is_in_shop_cart__user=self.request.user)
         return queryset
+
+    def filter_ordering(self, queryset, name, value):
+        return queryset.order_by(*ORDERINGS[value])
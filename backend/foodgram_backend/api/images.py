@@ -0,0 +1,82 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection
+from PIL import Image, ImageOps, features
+
+from .cache import bump_generation
+from .const import IMAGE_QUALITY, IMAGE_VARIANTS
+from recipes.models import Recipe
+
+logger = logging.getLogger(__name__)
+
+executor = ThreadPoolExecutor(max_workers=settings.IMAGE_WORKERS,
+                              thread_name_prefix='recipe-images')
+
+if features.check('webp'):
+    IMAGE_FORMAT, IMAGE_EXTENSION = 'WEBP', 'webp'
+else:
+    IMAGE_FORMAT, IMAGE_EXTENSION = 'JPEG', 'jpg'
+
+
+def variant_name(image_name, variant):
+    return 'foodgram/variants/{}_{}.{}'.format(
+        PurePosixPath(image_name).stem, variant, IMAGE_EXTENSION
+    )
+
+
+def needs_variants(recipe):
+    return bool(recipe.image) and (
+        recipe.image_card.name != variant_name(recipe.image.name, 'card')
+    )
+
+
+def encode_variant(image, size):
+    variant = image.copy()
+    variant.thumbnail(size, Image.LANCZOS)
+    if IMAGE_FORMAT == 'JPEG' or variant.mode not in ('RGB', 'RGBA'):
+        variant = variant.convert('RGB')
+    buffer = BytesIO()
+    variant.save(buffer, IMAGE_FORMAT, quality=IMAGE_QUALITY,
+                 optimize=True, progressive=True)
+    return ContentFile(buffer.getvalue())
+
+
+def make_image_variants(recipe_id, image_name):
+    storage = Recipe.image.field.storage
+    variant_storage = Recipe.image_card.field.storage
+    names = {variant: variant_name(image_name, variant)
+             for variant in IMAGE_VARIANTS}
+    try:
+        missing = [variant for variant, name in names.items()
+                   if not variant_storage.exists(name)]
+        if missing:
+            with storage.open(image_name) as file:
+                image = ImageOps.exif_transpose(Image.open(file))
+                image.load()
+            for variant in missing:
+                name = variant_storage.save(
+                    names[variant],
+                    encode_variant(image, IMAGE_VARIANTS[variant])
+                )
+                if name != names[variant]:
+                    variant_storage.delete(name)
+        variants = {f'image_{variant}': name
+                    for variant, name in names.items()}
+        if Recipe.objects.filter(pk=recipe_id, image=image_name).update(
+            **variants
+        ):
+            bump_generation('recipes')
+    except Exception:
+        logger.exception('Failed to make image variants for recipe %s',
+                         recipe_id)
+    finally:
+        connection.close()
+
+
+def submit_image_variants(recipe_id, image_name):
+    return executor.submit(make_image_variants, recipe_id, image_name)
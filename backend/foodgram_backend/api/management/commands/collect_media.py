@@ -0,0 +1,58 @@
+import posixpath
+from collections import Counter
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from recipes.models import Recipe
+
+IMAGE_FIELDS = ('image', 'image_thumbnail', 'image_card', 'image_full')
+
+
+class Command(BaseCommand):
+    help = 'Delete recipe images that are no longer referenced'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace', type=int, default=24 * 60 * 60,
+            help='Keep unreferenced files modified within this many seconds'
+        )
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report orphaned files without deleting')
+
+    def walk(self, storage, directory):
+        try:
+            directories, files = storage.listdir(directory)
+        except FileNotFoundError:
+            return
+        for name in files:
+            yield posixpath.join(directory, name)
+        for subdirectory in directories:
+            yield from self.walk(storage,
+                                 posixpath.join(directory, subdirectory))
+
+    def handle(self, *args, **options):
+        if options['grace'] < 0:
+            raise CommandError('--grace must not be negative')
+        storage = Recipe.image.field.storage
+        references = Counter()
+        for names in Recipe.objects.values_list(*IMAGE_FIELDS).iterator():
+            references.update(name for name in names if name)
+        threshold = timezone.now() - timedelta(seconds=options['grace'])
+        removed = size = 0
+        for name in self.walk(storage, 'foodgram'):
+            if (references[name]
+                    or storage.get_modified_time(name) >= threshold):
+                continue
+            removed += 1
+            size += storage.size(name)
+            if options['dry_run']:
+                self.stdout.write(name)
+            else:
+                storage.delete(name)
+        action = 'Found' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} {removed} orphaned files ({size} bytes), '
+            f'{len(references)} files referenced'
+        ))
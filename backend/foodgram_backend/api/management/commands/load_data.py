@@ -0,0 +1,130 @@
+import csv
+import json
+import re
+import time
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.cache import bump_generation
+from recipes.models import Ingredient, Tag
+
+JSON_CHUNK_SIZE = 64 * 1024
+JSON_WHITESPACE = re.compile(r'\s*')
+
+DATASETS = {
+    'ingredients': (Ingredient, ('name', 'measurement_unit')),
+    'tags': (Tag, ('name', 'slug', 'color')),
+}
+
+
+def iter_json_array(file, chunk_size=JSON_CHUNK_SIZE):
+    decoder = json.JSONDecoder()
+    buffer, position, eof = '', 0, False
+    expected = '['
+    while True:
+        position = JSON_WHITESPACE.match(buffer, position).end()
+        if position == len(buffer):
+            if eof:
+                raise ValueError('unexpected end of JSON array')
+            buffer, position = file.read(chunk_size), 0
+            eof = not buffer
+            continue
+        char = buffer[position]
+        if expected == '[':
+            if char != '[':
+                raise ValueError('expected a JSON array')
+            expected = 'first'
+            position += 1
+        elif expected == ',':
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError(f'expected "," at {char!r}')
+            expected = 'item'
+            position += 1
+        elif expected == 'first' and char == ']':
+            return
+        else:
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+                end = JSON_WHITESPACE.match(buffer, end).end()
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                end = None
+            if not eof and (end is None or end == len(buffer)
+                            or buffer[end] not in ',]'):
+                chunk = file.read(chunk_size)
+                eof = not chunk
+                buffer, position = buffer[position:] + chunk, 0
+                continue
+            yield item
+            expected = ','
+            position = end
+
+
+class Command(BaseCommand):
+    help = 'Load ingredients or tags from a CSV or JSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=DATASETS)
+        parser.add_argument(
+            '--path',
+            help='CSV file or JSON array of objects, both read in '
+                 'batches; defaults to DATA_DIR/<dataset>.csv'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Read and count rows without saving them')
+
+    def read_rows(self, file, path, fields):
+        if path.endswith('.json'):
+            for item in iter_json_array(file):
+                yield {field: item[field] for field in fields}
+        else:
+            for row in csv.reader(file):
+                yield dict(zip(fields, row))
+
+    def handle(self, *args, **options):
+        model, fields = DATASETS[options['dataset']]
+        path = options['path'] or str(
+            settings.DATA_DIR / f'{options["dataset"]}.csv'
+        )
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be a positive number')
+        started = time.perf_counter()
+        total = 0
+        try:
+            with open(path, encoding='UTF-8') as file, transaction.atomic():
+                existing = model.objects.count()
+                rows = self.read_rows(file, path, fields)
+                while batch := list(islice(rows, batch_size)):
+                    total += len(batch)
+                    if not options['dry_run']:
+                        model.objects.bulk_create(
+                            [model(**row) for row in batch],
+                            ignore_conflicts=True
+                        )
+                created = model.objects.count() - existing
+                if not options['dry_run']:
+                    transaction.on_commit(lambda: bump_generation(
+                        options['dataset'], 'recipes'
+                    ))
+        except FileNotFoundError:
+            raise CommandError(f'File {path} - not found')
+        except (KeyError, ValueError) as error:
+            raise CommandError(f'File {path} is malformed: {error}')
+        elapsed = time.perf_counter() - started
+        if options['dry_run']:
+            result = f'Checked {total} rows from {path}'
+        else:
+            result = (f'Loaded {total} rows from {path}: {created} new, '
+                      f'{total - created} already present')
+        self.stdout.write(self.style.SUCCESS(
+            f'{result} in {elapsed:.2f} s '
+            f'({total / max(elapsed, 1e-6):.0f} rows/s)'
+        ))
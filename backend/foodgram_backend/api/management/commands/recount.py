@@ -0,0 +1,56 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from recipes.models import Favourite, Follow, Recipe, ShoppingList, User
+from recipes.signals import add_popularity, popularity_score
+
+COUNTERS = (
+    (Recipe, 'favorites_count', Favourite, 'recipe'),
+    (Recipe, 'in_carts_count', ShoppingList, 'recipe'),
+    (User, 'recipes_count', Recipe, 'author'),
+    (User, 'followers_count', Follow, 'author'),
+)
+
+
+class Command(BaseCommand):
+    help = 'Recalculate denormalized recipe and user counters'
+
+    def recount_popularity(self):
+        popularity = defaultdict(float)
+        for recipe_id, added_date in Favourite.objects.values_list(
+            'recipe_id', 'added_date'
+        ).order_by('added_date').iterator():
+            popularity[recipe_id] = add_popularity(
+                popularity[recipe_id], popularity_score(added_date)
+            )
+        recipes = []
+        for recipe in Recipe.objects.only('popularity').iterator():
+            if recipe.popularity != popularity[recipe.pk]:
+                recipe.popularity = popularity[recipe.pk]
+                recipes.append(recipe)
+        Recipe.objects.bulk_update(recipes, ('popularity',), batch_size=1000)
+        return len(recipes)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            for model, field, related_model, related_field in COUNTERS:
+                actual = Coalesce(Subquery(
+                    related_model.objects.filter(
+                        **{related_field: OuterRef('pk')}
+                    ).order_by().values(related_field).annotate(
+                        count=Count('pk')
+                    ).values('count')
+                ), 0)
+                fixed = model.objects.exclude(
+                    **{field: actual}
+                ).update(**{field: actual})
+                self.stdout.write(self.style.SUCCESS(
+                    f'{model.__name__}.{field}: {fixed} rows fixed'
+                ))
+            self.stdout.write(self.style.SUCCESS(
+                f'Recipe.popularity: {self.recount_popularity()} rows fixed'
+            ))
@@ -1,6 +1,125 @@
+import hashlib
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from collections import OrderedDict
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
 from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class CachedCountPaginator(Paginator):
+    def __init__(self, *args, count_cache_key=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_cache_key = count_cache_key
+
+    @cached_property
+    def count(self):
+        if self.count_cache_key is None:
+            return super().count
+        count = cache.get(self.count_cache_key)
+        if count is None:
+            count = super().count
+            cache.set(self.count_cache_key, count,
+                      settings.API_CACHE_TIMEOUT)
+        return count
 
 
 class CustomPagination(pagination.PageNumberPagination):
     page_size_query_param = 'limit'
     page_size = 6
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Некорректный курсор.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_ordering = self.get_cursor_ordering(view)
+        if (self.cursor_ordering
+                and self.cursor_query_param in request.query_params):
+            return self.paginate_queryset_by_cursor(queryset, request)
+        self.django_paginator_class = partial(
+            CachedCountPaginator,
+            count_cache_key=self.get_count_cache_key(queryset, request, view)
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_cursor_ordering(self, view):
+        if hasattr(view, 'get_cursor_ordering'):
+            return view.get_cursor_ordering()
+        return getattr(view, 'cursor_ordering', None)
+
+    def get_count_cache_key(self, queryset, request, view):
+        get_generations = getattr(view, 'get_condition_generations', None)
+        if get_generations is None:
+            return None
+        raw_key = f'{queryset.query}:{get_generations(request)}'
+        return f'count:{hashlib.md5(raw_key.encode()).hexdigest()}'
+
+    def encode_cursor(self, obj):
+        values = [getattr(obj, field.lstrip('-'))
+                  for field in self.cursor_ordering]
+        return urlsafe_b64encode(json.dumps(
+            values, default=lambda value: value.isoformat()
+        ).encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            values = json.loads(urlsafe_b64decode(cursor.encode()))
+        except (BinasciiError, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if (not isinstance(values, list)
+                or len(values) != len(self.cursor_ordering)):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def get_cursor_filter(self, values):
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.cursor_ordering, values):
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            name = field.lstrip('-')
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def paginate_queryset_by_cursor(self, queryset, request):
+        self.request = request
+        self.cursor_mode = True
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.cursor_ordering)
+        cursor = request.query_params[self.cursor_query_param]
+        if cursor:
+            try:
+                queryset = queryset.filter(
+                    self.get_cursor_filter(self.decode_cursor(cursor))
+                )
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+        page = list(queryset[:page_size + 1])
+        self.next_cursor = None
+        if len(page) > page_size:
+            page = page[:page_size]
+            self.next_cursor = self.encode_cursor(page[-1])
+        return page
+
+    def get_paginated_response(self, data):
+        if not getattr(self, 'cursor_mode', False):
+            return super().get_paginated_response(data)
+        next_link = None
+        if self.next_cursor:
+            next_link = replace_query_param(
+                self.request.build_absolute_uri(), self.cursor_query_param,
+                self.next_cursor
+            )
+        return Response(OrderedDict([
+            ('next', next_link),
+            ('results', data),
+        ]))
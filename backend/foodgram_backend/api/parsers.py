@@ -0,0 +1,51 @@
+from io import BytesIO
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from .renderers import FastJSONRenderer, orjson
+
+WIDE_INTEGER = 2 ** 63
+DIGITS = bytes.maketrans(b'123456789E', b'000000000e')
+WIDE_DIGITS = b'0' * len(str(WIDE_INTEGER))
+
+
+def may_have_wide_number(data):
+    data = data.translate(DIGITS)
+    return WIDE_DIGITS in data or b'0e' in data
+
+
+def has_wide_number(value):
+    values = [value]
+    while values:
+        value = values.pop()
+        if isinstance(value, dict):
+            values.extend(value.values())
+        elif isinstance(value, list):
+            values.extend(value)
+        elif isinstance(value, float) and abs(value) >= WIDE_INTEGER:
+            return True
+    return False
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None or not self.strict:
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        data = stream.read()
+        is_utf8 = encoding.lower().replace('-', '') == 'utf8'
+        try:
+            if not is_utf8:
+                value = orjson.loads(data.decode(encoding))
+            else:
+                value = orjson.loads(data)
+        except (orjson.JSONDecodeError, UnicodeDecodeError, LookupError):
+            return super().parse(BytesIO(data), media_type, parser_context)
+        if ((not is_utf8 or may_have_wide_number(data))
+                and has_wide_number(value)):
+            return super().parse(BytesIO(data), media_type, parser_context)
+        return value
@@ -0,0 +1,74 @@
+import threading
+import time
+
+from django.conf import settings
+
+from .cache import get_generation
+from recipes.models import Ingredient, Tag
+
+
+class ReferenceData:
+    def __init__(self, model, generation):
+        self.model = model
+        self.generation = generation
+        self._lock = threading.Lock()
+        self._generation = None
+        self._expires = 0
+        self._objects = {}
+        self._lookups = {}
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def is_stale(self, generation):
+        return (generation != self._generation
+                or time.monotonic() >= self._expires)
+
+    def get_objects(self):
+        generation = get_generation(self.generation)
+        if self.is_stale(generation):
+            with self._lock:
+                if self.is_stale(generation):
+                    self._objects = self.model.objects.in_bulk()
+                    self._lookups = {}
+                    self._generation = generation
+                    self._expires = (time.monotonic()
+                                     + settings.REFERENCE_CACHE_TIMEOUT)
+        return self._objects
+
+    def get_lookup(self, field):
+        objects = self.get_objects()
+        lookup = self._lookups.get(field)
+        if lookup is None:
+            lookup = {getattr(obj, field): obj for obj in objects.values()}
+            self._lookups[field] = lookup
+        return lookup
+
+
+def to_pk(value):
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.isdecimal():
+        return int(value)
+    return None
+
+
+def get_reference_objects(reference, context):
+    key = f'reference:{reference.generation}'
+    if key not in context:
+        context[key] = reference.get_objects()
+    return context[key]
+
+
+def load_reference_objects(reference, context, values):
+    objects = get_reference_objects(reference, context)
+    missing = {to_pk(value) for value in values} - {None} - objects.keys()
+    if missing:
+        loaded = reference.model.objects.in_bulk(missing)
+        context[f'reference:{reference.generation}'] = {
+            **objects, **{pk: loaded.get(pk) for pk in missing}
+        }
+
+
+tag_cache = ReferenceData(Tag, 'tags')
+ingredient_cache = ReferenceData(Ingredient, 'ingredients')
@@ -0,0 +1,118 @@
+from .const import IMAGE_VARIANTS
+from .references import get_reference_objects, ingredient_cache, tag_cache
+from recipes.models import IngredientInRecipe
+
+
+def is_subscribed(user, request):
+    if not (request and request.user.is_authenticated):
+        return False
+    if hasattr(user, 'is_subscribed'):
+        return user.is_subscribed
+    return (user != request.user
+            and user.author.filter(user=request.user).exists())
+
+
+class Representation:
+    def __init__(self, context, fields):
+        self.context = context
+        self.request = context.get('request')
+        self.fields = [(name, getattr(self, f'get_{name}', None))
+                       for name in fields]
+        self.image_urls = {}
+
+    def get_image_url(self, image):
+        if not image:
+            return None
+        key = (image.storage, image.name)
+        if key not in self.image_urls:
+            try:
+                url = image.url
+            except AttributeError:
+                url = None
+            if url is not None and self.request is not None:
+                url = self.request.build_absolute_uri(url)
+            self.image_urls[key] = url
+        return self.image_urls[key]
+
+    def __call__(self, instance):
+        return {name: getattr(instance, name) if getter is None
+                else getter(instance)
+                for name, getter in self.fields}
+
+
+class UserRepresentation(Representation):
+    def get_is_subscribed(self, user):
+        return is_subscribed(user, self.request)
+
+
+class RecipeRepresentation(Representation):
+    def __init__(self, context, fields, author=None, tag_fields=(),
+                 ingredient_fields=(), detail=False):
+        super().__init__(context, fields)
+        self.author = author
+        self.tag_fields = tag_fields
+        self.ingredient_fields = ingredient_fields
+        self.detail = detail
+
+    def get_author(self, recipe):
+        return self.author(recipe.author)
+
+    def get_tags(self, recipe):
+        tags = get_reference_objects(tag_cache, self.context)
+        representations = []
+        for tag in recipe.tags.all():
+            if tag.get_deferred_fields():
+                tag = tags.get(tag.pk, tag)
+            representations.append(
+                {name: getattr(tag, name) for name in self.tag_fields}
+            )
+        return representations
+
+    def get_ingredients(self, recipe):
+        ingredients = get_reference_objects(ingredient_cache, self.context)
+        representations = []
+        for line in recipe.ingredient_in_recipe.all():
+            if IngredientInRecipe.ingredient.is_cached(line):
+                ingredient = line.ingredient
+            else:
+                ingredient = (ingredients.get(line.ingredient_id)
+                              or line.ingredient)
+            representations.append({
+                name: line.amount if name == 'amount'
+                else getattr(ingredient, name)
+                for name in self.ingredient_fields
+            })
+        return representations
+
+    def get_is_favorited(self, recipe):
+        return bool(getattr(recipe, 'is_favorited', False))
+
+    def get_is_in_shopping_cart(self, recipe):
+        return bool(getattr(recipe, 'is_in_shopping_cart', False))
+
+    def get_variant_url(self, recipe, variant):
+        return self.get_image_url(
+            getattr(recipe, f'image_{variant}') or recipe.image
+        )
+
+    def get_image(self, recipe):
+        if self.detail:
+            return self.get_image_url(recipe.image)
+        return self.get_variant_url(recipe, 'card')
+
+    def get_images(self, recipe):
+        return {variant: self.get_variant_url(recipe, variant)
+                for variant in IMAGE_VARIANTS}
+
+
+class FollowRepresentation(UserRepresentation):
+    def __init__(self, context, fields, recipe):
+        super().__init__(context, fields)
+        self.recipe = recipe
+
+    def get_recipes(self, user):
+        if hasattr(user, 'limited_recipes'):
+            recipes = user.limited_recipes
+        else:
+            recipes = user.recipes.all()[:self.context.get('recipes_limit')]
+        return [self.recipe(recipe) for recipe in recipes]
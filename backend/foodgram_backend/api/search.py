@@ -0,0 +1,139 @@
+import json
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from itertools import chain
+
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.settings import api_settings
+
+from .cache import get_generation
+from recipes.models import Ingredient
+
+
+def normalize(value):
+    return value.casefold().replace('ё', 'е')
+
+
+def trigrams(term):
+    padded = f'  {term} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class IngredientIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = None
+        self._expires = 0
+        self._entries = ((), (), '', (), {}, ())
+
+    def build(self):
+        ingredients = sorted(
+            Ingredient.objects.values('id', 'name', 'measurement_unit'),
+            key=lambda row: (normalize(row['name']), row['id'])
+        )
+        keys = tuple(normalize(row['name']) for row in ingredients)
+        rows = tuple(
+            json.dumps(row, ensure_ascii=False, separators=(',', ':'))
+            for row in ingredients
+        )
+        haystack = '\n'.join(keys)
+        offsets = []
+        offset = 0
+        for key in keys:
+            offsets.append(offset)
+            offset += len(key) + 1
+        postings = defaultdict(list)
+        terms = []
+        for position, key in enumerate(keys):
+            for term in {key, *key.split()}:
+                term_trigrams = trigrams(term)
+                for trigram in term_trigrams:
+                    postings[trigram].append(len(terms))
+                terms.append((position, len(term_trigrams)))
+        return (keys, rows, haystack, tuple(offsets), dict(postings),
+                tuple(terms))
+
+    def is_stale(self, generation):
+        return (generation != self._generation
+                or time.monotonic() >= self._expires)
+
+    def get_entries(self):
+        generation = get_generation('ingredients')
+        if self.is_stale(generation):
+            with self._lock:
+                if self.is_stale(generation):
+                    self._entries = self.build()
+                    self._generation = generation
+                    self._expires = (time.monotonic()
+                                     + settings.REFERENCE_CACHE_TIMEOUT)
+        return self._entries
+
+    def prefix_range(self, keys, prefix):
+        start = bisect_left(keys, prefix)
+        return range(start, bisect_left(keys, prefix + chr(0x10FFFF), start))
+
+    def substring_positions(self, haystack, offsets, query):
+        if not query or '\n' in query:
+            return
+        index = haystack.find(query)
+        while index != -1:
+            position = bisect_right(offsets, index) - 1
+            yield position
+            if position + 1 == len(offsets):
+                return
+            index = haystack.find(query, offsets[position + 1])
+
+    def search(self, prefix):
+        keys, rows, *_ = self.get_entries()
+        return [rows[position]
+                for position in self.prefix_range(keys, normalize(prefix))]
+
+    def ranked_search(self, query, limit):
+        keys, rows, haystack, offsets, postings, terms = self.get_entries()
+        query = normalize(query)
+        found = dict.fromkeys(self.prefix_range(keys, query))
+        if len(found) < limit:
+            found.update(dict.fromkeys(
+                self.substring_positions(haystack, offsets, query)
+            ))
+        if len(found) < limit:
+            query_trigrams = trigrams(query)
+            shared = Counter(chain.from_iterable(
+                postings.get(trigram, ()) for trigram in query_trigrams
+            ))
+            similarity = {}
+            for term, count in shared.items():
+                position, size = terms[term]
+                score = count / (len(query_trigrams) + size - count)
+                if (score >= settings.INGREDIENT_SEARCH_SIMILARITY
+                        and score > similarity.get(position, 0)):
+                    similarity[position] = score
+            found.update(dict.fromkeys(sorted(
+                similarity, key=lambda position: -similarity[position]
+            )))
+        return [rows[position] for position in list(found)[:limit]]
+
+
+ingredient_index = IngredientIndex()
+
+
+class IngredientSearchMixin:
+    def list(self, request, *args, **kwargs):
+        name = request.query_params.get(api_settings.SEARCH_PARAM)
+        if (not settings.INGREDIENT_SEARCH_INDEX or name is None
+                or request.accepted_renderer.format != 'json'):
+            return super().list(request, *args, **kwargs)
+        search_mode = request.query_params.get(
+            'search_mode', settings.INGREDIENT_SEARCH_MODE
+        )
+        if search_mode == 'ranked':
+            rows = ingredient_index.ranked_search(
+                name, settings.INGREDIENT_SEARCH_LIMIT
+            )
+        else:
+            rows = ingredient_index.search(name)
+        return HttpResponse('[{}]'.format(','.join(rows)),
+                            content_type='application/json')
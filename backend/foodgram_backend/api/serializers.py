@@ -1,8 +1,21 @@
+import json
+from collections import OrderedDict
+from collections.abc import Mapping
+
 import webcolors
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction
+from django.http import QueryDict
+from django.utils.functional import cached_property
 from drf_extra_fields.fields import Base64ImageField
 from rest_framework import serializers
 
-from .const import MAX_VALUE, MIN_VALUE
+from .const import IMAGE_VARIANTS, MAX_VALUE, MIN_VALUE
+from .references import (get_reference_objects, ingredient_cache,
+                         load_reference_objects, tag_cache, to_pk)
+from .representations import (FollowRepresentation, RecipeRepresentation,
+                              UserRepresentation, is_subscribed)
 from recipes.models import (Ingredient, IngredientInRecipe, Favourite, Follow,
                             Recipe, ShoppingList, Tag, User)
 
@@ -19,6 +32,48 @@ class Hex2NameColor(serializers.Field):
         return data
 
 
+class ReferenceRelatedField(serializers.PrimaryKeyRelatedField):
+    def __init__(self, reference, **kwargs):
+        self.reference = reference
+        super().__init__(queryset=reference.model.objects.all(), **kwargs)
+
+    def to_internal_value(self, data):
+        objects = get_reference_objects(self.reference, self.context)
+        pk = to_pk(data)
+        if pk not in objects:
+            return super().to_internal_value(data)
+        if objects[pk] is None:
+            self.fail('does_not_exist', pk_value=data)
+        return objects[pk]
+
+
+class RecipeImageUploadField(Base64ImageField):
+    def to_internal_value(self, data):
+        if isinstance(data, UploadedFile):
+            return serializers.ImageField.to_internal_value(self, data)
+        return super().to_internal_value(data)
+
+
+class RecipeImageField(serializers.ImageField):
+    def __init__(self, variant=None, original_on_detail=False, **kwargs):
+        self.variant = variant
+        self.original_on_detail = original_on_detail
+        super().__init__(source='*', read_only=True, **kwargs)
+
+    def get_variant(self, recipe, variant):
+        return super().to_representation(
+            getattr(recipe, f'image_{variant}') or recipe.image
+        )
+
+    def to_representation(self, value):
+        if self.variant is None:
+            return {variant: self.get_variant(value, variant)
+                    for variant in IMAGE_VARIANTS}
+        if self.original_on_detail and self.parent.parent is None:
+            return super().to_representation(value.image)
+        return self.get_variant(value, self.variant)
+
+
 class FoodgramUserSerializer(serializers.ModelSerializer):
     is_subscribed = serializers.SerializerMethodField()
 
@@ -30,9 +85,7 @@ class FoodgramUserSerializer(serializers.ModelSerializer):
         )
 
     def get_is_subscribed(self, obj):
-        request = self.context['request']
-        return (request and request.user.is_authenticated
-                and obj.author.filter(user=request.user).exists())
+        return is_subscribed(obj, self.context['request'])
 
 
 class TagSerializer(serializers.ModelSerializer):
@@ -42,6 +95,13 @@ class TagSerializer(serializers.ModelSerializer):
         model = Tag
         fields = '__all__'
 
+    def to_representation(self, instance):
+        if instance.get_deferred_fields():
+            instance = get_reference_objects(
+                tag_cache, self.context
+            ).get(instance.pk, instance)
+        return super().to_representation(instance)
+
 
 class IngredientSerializer(serializers.ModelSerializer):
 
@@ -64,9 +124,28 @@ class IngredientInRecipeSerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'measurement_unit', 'amount')
         read_only_fields = ('amount',)
 
+    def to_representation(self, instance):
+        if not IngredientInRecipe.ingredient.is_cached(instance):
+            ingredient = get_reference_objects(
+                ingredient_cache, self.context
+            ).get(instance.ingredient_id)
+            if ingredient is not None:
+                IngredientInRecipe.ingredient.field.set_cached_value(
+                    instance, ingredient
+                )
+        return super().to_representation(instance)
+
+
+class IngredientInRecipeCompactSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source='ingredient_id', read_only=True)
+
+    class Meta:
+        model = IngredientInRecipe
+        fields = ('id', 'amount')
+
 
 class IngredientInRecipeCreateSerializer(serializers.ModelSerializer):
-    id = serializers.PrimaryKeyRelatedField(queryset=Ingredient.objects.all())
+    id = ReferenceRelatedField(ingredient_cache)
     amount = serializers.IntegerField(
         max_value=MAX_VALUE,
         min_value=MIN_VALUE,
@@ -88,20 +167,86 @@ class RecipeSerializer(serializers.ModelSerializer):
                                                many=True)
     is_favorited = serializers.BooleanField(default=False)
     is_in_shopping_cart = serializers.BooleanField(default=False)
+    image = RecipeImageField('card', original_on_detail=True)
+    images = RecipeImageField()
 
     class Meta:
         model = Recipe
-        exclude = ('pub_date',)
+        exclude = ('pub_date', 'favorites_count', 'in_carts_count',
+                   'popularity', 'image_thumbnail', 'image_card',
+                   'image_full')
+
+    @classmethod
+    def parse_sparse_fields(cls, query_params):
+        if 'fields' not in query_params and 'expand' not in query_params:
+            return None
+        names = list(cls(context={}).fields)
+        sparse_fields = []
+        for param, allowed in (('fields', names),
+                               ('expand', ('author', 'tags', 'ingredients'))):
+            values = {value for item in query_params.getlist(param)
+                      for value in item.split(',') if value}
+            unknown = values - set(allowed)
+            if unknown:
+                raise serializers.ValidationError({
+                    param: 'Неизвестные поля: {}.'.format(
+                        ', '.join(sorted(unknown))
+                    )
+                })
+            sparse_fields.append(values)
+        fields, expand = sparse_fields
+        return fields or set(names), expand
+
+    def get_compact_fields(self):
+        return {
+            'author': serializers.IntegerField(source='author_id',
+                                               read_only=True),
+            'tags': serializers.PrimaryKeyRelatedField(many=True,
+                                                       read_only=True),
+            'ingredients': IngredientInRecipeCompactSerializer(
+                source='ingredient_in_recipe', many=True, read_only=True
+            ),
+        }
+
+    @cached_property
+    def fast_representation(self):
+        if (not settings.FAST_SERIALIZERS
+                or self.context.get('sparse_fields') is not None):
+            return None
+        fields = self.fields
+        return RecipeRepresentation(
+            self.context, list(fields),
+            author=UserRepresentation(self.context,
+                                      list(fields['author'].fields)),
+            tag_fields=list(fields['tags'].child.fields),
+            ingredient_fields=list(fields['ingredients'].child.fields),
+            detail=self.parent is None
+        )
+
+    def to_representation(self, instance):
+        if self.fast_representation is None:
+            return super().to_representation(instance)
+        return self.fast_representation(instance)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        sparse_fields = self.context.get('sparse_fields')
+        if sparse_fields is None:
+            return fields
+        selected, expand = sparse_fields
+        compact_fields = self.get_compact_fields()
+        return OrderedDict(
+            (name, field if name in expand or name not in compact_fields
+             else compact_fields[name])
+            for name, field in fields.items() if name in selected
+        )
 
 
 class RecipeCreateSerializer(serializers.ModelSerializer):
     author = FoodgramUserSerializer(read_only=True,)
-    tags = serializers.PrimaryKeyRelatedField(
-        queryset=Tag.objects.all(),
-        many=True
-    )
+    tags = ReferenceRelatedField(tag_cache, many=True)
     ingredients = IngredientInRecipeCreateSerializer(many=True)
-    image = Base64ImageField(allow_null=False, allow_empty_file=False)
+    image = RecipeImageUploadField(allow_null=False, allow_empty_file=False)
     cooking_time = serializers.IntegerField(
         max_value=MAX_VALUE,
         min_value=MIN_VALUE,
@@ -113,9 +258,39 @@ class RecipeCreateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Recipe
-        exclude = ('pub_date',)
+        exclude = ('pub_date', 'favorites_count', 'in_carts_count',
+                   'popularity', 'image_thumbnail', 'image_card',
+                   'image_full')
         read_only_fields = ('pub_date',)
 
+    def parse_multipart(self, data):
+        data = data.dict()
+        for field in ('ingredients', 'tags'):
+            if isinstance(data.get(field), str):
+                try:
+                    data[field] = json.loads(data[field])
+                except ValueError:
+                    raise serializers.ValidationError(
+                        {field: ['Значение должно быть корректным JSON.']}
+                    )
+        return data
+
+    def to_internal_value(self, data):
+        if isinstance(data, QueryDict):
+            data = self.parse_multipart(data)
+        if isinstance(data, Mapping):
+            ingredients = data.get('ingredients')
+            if isinstance(ingredients, list):
+                load_reference_objects(
+                    ingredient_cache, self.context,
+                    [ingredient.get('id') for ingredient in ingredients
+                     if isinstance(ingredient, Mapping)]
+                )
+            tags = data.get('tags')
+            if isinstance(tags, list):
+                load_reference_objects(tag_cache, self.context, tags)
+        return super().to_internal_value(data)
+
     def validate_tags(self, value):
         if not value:
             raise serializers.ValidationError(
@@ -149,6 +324,7 @@ class RecipeCreateSerializer(serializers.ModelSerializer):
         ]
         IngredientInRecipe.objects.bulk_create(ingredients)
 
+    @transaction.atomic
     def create(self, validated_data):
         ingredients_data = validated_data.pop('ingredients')
         tags_data = validated_data.pop('tags')
@@ -158,12 +334,35 @@ class RecipeCreateSerializer(serializers.ModelSerializer):
         self.create_ingredient_in_recipe(recipe, ingredients_data)
         return recipe
 
+    def update_ingredient_in_recipe(self, recipe, ingredients_data):
+        amounts = {ingredient['id'].pk: ingredient['amount']
+                   for ingredient in ingredients_data}
+        existing = {ingredient.ingredient_id: ingredient
+                    for ingredient in recipe.ingredient_in_recipe.all()}
+        changed = []
+        for ingredient_id, ingredient in existing.items():
+            amount = amounts.get(ingredient_id, ingredient.amount)
+            if amount != ingredient.amount:
+                ingredient.amount = amount
+                changed.append(ingredient)
+        if changed:
+            IngredientInRecipe.objects.bulk_update(changed, ('amount',))
+        removed = existing.keys() - amounts.keys()
+        if removed:
+            recipe.ingredient_in_recipe.filter(
+                ingredient_id__in=removed
+            ).delete()
+        added = [ingredient for ingredient in ingredients_data
+                 if ingredient['id'].pk not in existing]
+        if added:
+            self.create_ingredient_in_recipe(recipe, added)
+
+    @transaction.atomic
     def update(self, instance, validated_data):
         ingredients_data = validated_data.pop('ingredients')
         tags_data = validated_data.pop('tags')
         instance.tags.set(tags_data)
-        instance.ingredient_in_recipe.all().delete()
-        self.create_ingredient_in_recipe(instance, ingredients_data)
+        self.update_ingredient_in_recipe(instance, ingredients_data)
         return super().update(instance, validated_data)
 
     def to_representation(self, obj):
@@ -171,9 +370,12 @@ class RecipeCreateSerializer(serializers.ModelSerializer):
 
 
 class FavouriteShopListSerializer(serializers.ModelSerializer):
+    image = RecipeImageField('card')
+    images = RecipeImageField()
+
     class Meta:
         model = Recipe
-        fields = ('id', 'name', 'image', 'cooking_time')
+        fields = ('id', 'name', 'image', 'images', 'cooking_time')
 
 
 class FavouriteShopListCreateSerializer(serializers.ModelSerializer):
@@ -208,9 +410,7 @@ class ShoppingListCreateSerializer(FavouriteShopListCreateSerializer):
 
 class FollowSerializer(FoodgramUserSerializer):
     recipes = serializers.SerializerMethodField()
-    recipes_count = serializers.ReadOnlyField(
-        source='recipes.count'
-    )
+    recipes_count = serializers.ReadOnlyField()
 
     class Meta:
         model = User
@@ -218,17 +418,27 @@ class FollowSerializer(FoodgramUserSerializer):
             'id', 'username', 'email', 'first_name',
             'last_name', 'is_subscribed', 'recipes', 'recipes_count')
 
-    def get_recipes(self, obj):
-        recipes = obj.recipes.all()
-        recipes_limit = (
-            self.context['request'].query_params.get('recipes_limit')
+    @cached_property
+    def fast_representation(self):
+        if not settings.FAST_SERIALIZERS:
+            return None
+        return FollowRepresentation(
+            self.context, list(self.fields),
+            RecipeRepresentation(self.context, list(
+                FavouriteShopListSerializer(context=self.context).fields
+            ))
         )
-        if recipes_limit:
-            try:
-                recipes_limit = int(recipes_limit)
-            except ValueError:
-                pass
-        recipes = recipes[:recipes_limit]
+
+    def to_representation(self, instance):
+        if self.fast_representation is None:
+            return super().to_representation(instance)
+        return self.fast_representation(instance)
+
+    def get_recipes(self, obj):
+        if hasattr(obj, 'limited_recipes'):
+            recipes = obj.limited_recipes
+        else:
+            recipes = obj.recipes.all()[:self.context.get('recipes_limit')]
         return FavouriteShopListSerializer(recipes, many=True,
                                            context=self.context).data
 
@@ -0,0 +1,89 @@
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import token_cache_key
+from .cache import bump_generation, user_generation
+from .images import needs_variants, submit_image_variants
+from recipes.models import (Favourite, Follow, Ingredient, IngredientInRecipe,
+                            Recipe, ShoppingList, Tag, User)
+
+
+def bump_generation_on_commit(*names):
+    transaction.on_commit(partial(bump_generation, *names))
+
+
+def forget_tokens_on_commit(*keys):
+    transaction.on_commit(partial(
+        cache.delete_many, [token_cache_key(key) for key in keys]
+    ))
+
+
+@receiver((post_save, post_delete), sender=Recipe)
+@receiver((post_save, post_delete), sender=IngredientInRecipe)
+def invalidate_recipes(**kwargs):
+    bump_generation_on_commit('recipes')
+
+
+@receiver(post_save, sender=Recipe)
+def schedule_image_variants(instance, raw, **kwargs):
+    if not raw and needs_variants(instance):
+        transaction.on_commit(partial(
+            submit_image_variants, instance.pk, instance.image.name
+        ))
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def invalidate_recipe_tags(action, **kwargs):
+    if action.startswith('post_'):
+        bump_generation_on_commit('recipes')
+
+
+@receiver((post_save, post_delete), sender=Tag)
+def invalidate_tags(**kwargs):
+    bump_generation_on_commit('tags', 'recipes')
+
+
+@receiver((post_save, post_delete), sender=Ingredient)
+def invalidate_ingredients(**kwargs):
+    bump_generation_on_commit('ingredients', 'recipes')
+
+
+@receiver((post_save, post_delete), sender=Favourite)
+@receiver((post_save, post_delete), sender=ShoppingList)
+@receiver((post_save, post_delete), sender=Follow)
+def invalidate_user_state(instance, **kwargs):
+    bump_generation_on_commit(user_generation(instance.user_id))
+
+
+@receiver((post_save, post_delete), sender=Favourite)
+def invalidate_popularity(**kwargs):
+    bump_generation_on_commit('popularity')
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(instance, **kwargs):
+    forget_tokens_on_commit(instance.key)
+
+
+def is_login_update(update_fields):
+    return bool(update_fields) and set(update_fields) == {'last_login'}
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_recipes(instance, created, update_fields, **kwargs):
+    if not created and not is_login_update(update_fields):
+        bump_generation_on_commit('recipes')
+
+
+@receiver(post_save, sender=User)
+def forget_user_tokens(instance, created, update_fields, **kwargs):
+    if created or is_login_update(update_fields):
+        return
+    keys = Token.objects.filter(user=instance).values_list('key', flat=True)
+    if keys:
+        forget_tokens_on_commit(*keys)
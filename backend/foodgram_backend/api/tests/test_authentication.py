@@ -0,0 +1,88 @@
+import pickle
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+
+from api.authentication import CachedTokenAuthentication, token_cache_key
+from recipes.models import User
+
+
+class CachedTokenAuthenticationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='user', email='user@foodgram.ru', password='password',
+            first_name='Имя', last_name='Фамилия'
+        )
+        cls.token = Token.objects.create(user=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.authentication = CachedTokenAuthentication()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_warm_cache_authenticates_without_queries(self):
+        self.authentication.authenticate_credentials(self.token.key)
+        with self.assertNumQueries(0):
+            user, token = self.authentication.authenticate_credentials(
+                self.token.key
+            )
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertTrue(user.is_authenticated)
+        self.assertEqual(token.key, self.token.key)
+
+    def test_warm_request_does_not_query_tokens_or_users(self):
+        self.client.get('/api/users/me/state/')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/users/me/state/')
+        self.assertEqual(response.status_code, 200)
+        tables = (Token._meta.db_table, User._meta.db_table)
+        for query in queries.captured_queries:
+            for table in tables:
+                self.assertNotIn(f'"{table}"', query['sql'])
+
+    def test_cache_does_not_store_password(self):
+        self.authentication.authenticate_credentials(self.token.key)
+        snapshot = cache.get(token_cache_key(self.token.key))
+        self.assertNotIn(self.user.password.encode(), pickle.dumps(snapshot))
+
+    def test_deferred_user_loads_profile(self):
+        self.client.get('/api/users/me/')
+        response = self.client.get('/api/users/me/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['username'], 'user')
+        self.assertEqual(response.data['email'], 'user@foodgram.ru')
+        self.assertEqual(response.data['first_name'], 'Имя')
+
+    def test_logout_revokes_cached_token(self):
+        self.client.get('/api/users/me/')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/auth/token/logout/')
+        self.assertEqual(response.status_code, 204)
+        response = self.client.get('/api/users/me/')
+        self.assertEqual(response.status_code, 401)
+
+    def test_deactivation_revokes_cached_token(self):
+        self.authentication.authenticate_credentials(self.token.key)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate_credentials(self.token.key)
+
+    def test_cached_user_saves_only_loaded_fields(self):
+        self.authentication.authenticate_credentials(self.token.key)
+        user, _ = self.authentication.authenticate_credentials(
+            self.token.key
+        )
+        user.set_password('new-password')
+        user.save()
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('new-password'))
+        self.assertEqual(self.user.email, 'user@foodgram.ru')
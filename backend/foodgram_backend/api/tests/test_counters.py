@@ -0,0 +1,91 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db.models import F
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from api.serializers import RecipeCreateSerializer
+from recipes.models import Ingredient, Recipe, Tag, User
+
+
+class CounterFieldsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='user', email='user@foodgram.ru', password='password',
+            first_name='Имя', last_name='Фамилия'
+        )
+        cls.tag = Tag.objects.create(name='Тег', slug='tag', color='#000000')
+        cls.ingredient = Ingredient.objects.create(name='Соль',
+                                                   measurement_unit='г')
+        cls.recipe = Recipe.objects.create(
+            author=cls.user, name='Рецепт', text='Описание',
+            cooking_time=10, image='foodgram/recipe.png'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Token {}'.format(
+                Token.objects.create(user=self.user).key
+            )
+        )
+
+    def test_set_password_keeps_user_counters(self):
+        self.client.get('/api/users/me/')
+        User.objects.filter(pk=self.user.pk).update(
+            recipes_count=8, followers_count=3
+        )
+        response = self.client.post('/api/users/set_password/', {
+            'current_password': 'password',
+            'new_password': 'Nfrjq-Gfhjkm-2024',
+        })
+        self.assertEqual(response.status_code, 204)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.recipes_count, 8)
+        self.assertEqual(self.user.followers_count, 3)
+        self.assertTrue(self.user.check_password('Nfrjq-Gfhjkm-2024'))
+
+    def test_recipe_update_keeps_recipe_counters(self):
+        recipe = Recipe.objects.get(pk=self.recipe.pk)
+        Recipe.objects.filter(pk=recipe.pk).update(
+            favorites_count=F('favorites_count') + 2,
+            in_carts_count=F('in_carts_count') + 1,
+            popularity=F('popularity') + 1.5
+        )
+        recipe.name = 'Новое название'
+        recipe.save()
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.name, 'Новое название')
+        self.assertEqual(
+            (recipe.favorites_count, recipe.in_carts_count,
+             recipe.popularity),
+            (2, 1, 1.5)
+        )
+
+    def test_recipe_patch_keeps_recipe_counters(self):
+        update_ingredients = RecipeCreateSerializer.update_ingredient_in_recipe
+
+        def favourite_during_update(serializer, recipe, ingredients_data):
+            Recipe.objects.filter(pk=recipe.pk).update(
+                favorites_count=F('favorites_count') + 1
+            )
+            update_ingredients(serializer, recipe, ingredients_data)
+
+        with mock.patch.object(RecipeCreateSerializer,
+                               'update_ingredient_in_recipe',
+                               favourite_during_update):
+            response = self.client.patch(
+                f'/api/recipes/{self.recipe.pk}/',
+                {'name': 'Новое название', 'text': 'Описание',
+                 'cooking_time': 5, 'tags': [self.tag.pk],
+                 'ingredients': [{'id': self.ingredient.pk, 'amount': 2}]},
+                format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.favorites_count, 1)
+        self.assertEqual(self.recipe.cooking_time, 5)
@@ -0,0 +1,48 @@
+from unittest import mock, skipUnless
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api import exports
+from recipes.models import (Ingredient, IngredientInRecipe, Recipe,
+                            ShoppingList, User)
+
+
+class ShoppingCartPdfTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='user', email='user@foodgram.ru', password='password',
+            first_name='Имя', last_name='Фамилия'
+        )
+        recipe = Recipe.objects.create(
+            author=cls.user, name='Рецепт', text='Описание',
+            cooking_time=10, image='foodgram/recipe.png'
+        )
+        IngredientInRecipe.objects.create(
+            recipe=recipe, amount=5,
+            ingredient=Ingredient.objects.create(name='Соль',
+                                                 measurement_unit='г')
+        )
+        ShoppingList.objects.create(user=cls.user, recipe=recipe)
+
+    @skipUnless(exports.Canvas, 'reportlab is not installed')
+    @override_settings(PDF_FONT_PATH='/nonexistent/font.ttf')
+    def test_missing_font_disables_pdf(self):
+        with mock.patch.object(exports.pdfmetrics, 'getRegisteredFontNames',
+                               return_value=[]), \
+                self.assertLogs('api.exports', 'WARNING'):
+            self.assertFalse(exports.register_pdf_font())
+
+    def test_pdf_is_offered_only_with_font(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get('/api/recipes/download_shopping_cart/',
+                              {'format': 'pdf'})
+        if exports.PdfRenderer not in exports.SHOPPING_CART_RENDERERS:
+            self.assertEqual(response.status_code, 404)
+            return
+        self.assertEqual(response.status_code, 200)
+        content = b''.join(response.streaming_content)
+        self.assertTrue(content.startswith(b'%PDF'))
+        self.assertIn(b'/Subtype /TrueType', content)
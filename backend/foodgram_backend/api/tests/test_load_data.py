@@ -0,0 +1,41 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from api.management.commands.load_data import iter_json_array
+from recipes.models import Ingredient
+
+
+class LoadDataTest(TestCase):
+    def test_default_path_points_to_bundled_data(self):
+        call_command('load_data', 'ingredients', stdout=StringIO())
+        self.assertTrue(Ingredient.objects.exists())
+
+    def test_json_is_streamed_and_reloaded_idempotently(self):
+        items = [{'name': f'Ингредиент {i}', 'measurement_unit': 'г'}
+                 for i in range(100)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'ingredients.json'
+            path.write_text(json.dumps(items, ensure_ascii=False),
+                            encoding='UTF-8')
+            for _ in range(2):
+                call_command('load_data', 'ingredients', '--path',
+                             str(path), '--batch-size', '7',
+                             stdout=StringIO())
+        self.assertEqual(Ingredient.objects.count(), len(items))
+
+    def test_iter_json_array_reads_in_chunks(self):
+        text = '[{"name": "]", "amount": 1e5}, [1, 22], "a,b", 333]'
+        for chunk_size in (1, 2, 5, 1000):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(
+                    list(iter_json_array(StringIO(text), chunk_size)),
+                    json.loads(text)
+                )
+        for text in ('', '{}', '[1,', '[1 2]', '[1,]'):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                list(iter_json_array(StringIO(text), 2))
@@ -0,0 +1,122 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from recipes.models import Recipe, User
+
+
+class RecipeCursorPaginationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = author = User.objects.create_user(
+            username='author', email='author@foodgram.ru',
+            password='password', first_name='Имя', last_name='Фамилия'
+        )
+        for i in range(11):
+            recipe = Recipe.objects.create(
+                author=author, name=f'Рецепт {i}', text='Описание',
+                cooking_time=i % 4 + 1, image='foodgram/recipe.png'
+            )
+            Recipe.objects.filter(pk=recipe.pk).update(popularity=i % 3)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def get_ids(self, params):
+        response = self.client.get('/api/recipes/', params)
+        self.assertEqual(response.status_code, 200)
+        return [recipe['id'] for recipe in response.data['results']]
+
+    def get_cursor_ids(self, params):
+        ids = []
+        response = self.client.get('/api/recipes/', {**params, 'cursor': ''})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            ids.extend(recipe['id'] for recipe in response.data['results'])
+            if response.data['next'] is None:
+                return ids
+            response = self.client.get(response.data['next'])
+
+    def test_cursor_follows_requested_ordering(self):
+        for ordering in (None, 'new', 'popular', 'quick'):
+            params = {'limit': 3, 'fields': 'id'}
+            if ordering:
+                params['ordering'] = ordering
+            with self.subTest(ordering=ordering):
+                self.assertEqual(
+                    self.get_cursor_ids(params),
+                    self.get_ids({**params, 'limit': 100})
+                )
+
+    def test_cursor_pages_survive_writes_between_pages(self):
+        for ordering in (None, 'popular'):
+            params = {'limit': 3, 'fields': 'id'}
+            if ordering:
+                params['ordering'] = ordering
+            with self.subTest(ordering=ordering):
+                expected = self.get_ids({**params, 'limit': 100})
+                ids = []
+                response = self.client.get('/api/recipes/',
+                                           {**params, 'cursor': ''})
+                while True:
+                    page = [recipe['id']
+                            for recipe in response.data['results']]
+                    ids.extend(page)
+                    if response.data['next'] is None:
+                        break
+                    Recipe.objects.filter(pk=page[0]).delete()
+                    Recipe.objects.create(
+                        author=self.author, name='Новый рецепт',
+                        text='Описание', cooking_time=1,
+                        image='foodgram/recipe.png'
+                    )
+                    response = self.client.get(response.data['next'])
+                    self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(ids), len(set(ids)))
+                self.assertLessEqual(set(expected), set(ids))
+
+
+class RecipeCountCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(
+            username='author', email='author@foodgram.ru',
+            password='password', first_name='Имя', last_name='Фамилия'
+        )
+        for _ in range(5):
+            cls.create_recipe()
+
+    @classmethod
+    def create_recipe(cls):
+        return Recipe.objects.create(
+            author=cls.author, name='Рецепт', text='Описание',
+            cooking_time=10, image='foodgram/recipe.png'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def get_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/recipes/',
+                                       {'limit': 2, 'fields': 'id'})
+        self.assertEqual(response.status_code, 200)
+        counted = any('COUNT(' in query['sql']
+                      for query in queries.captured_queries)
+        return response.data['count'], counted
+
+    def test_count_is_cached_until_recipes_change(self):
+        self.assertEqual(self.get_count(), (5, True))
+        self.assertEqual(self.get_count(), (5, False))
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe = self.create_recipe()
+        self.assertEqual(self.get_count(), (6, True))
+        self.assertEqual(self.get_count(), (6, False))
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe.delete()
+        self.assertEqual(self.get_count(), (5, True))
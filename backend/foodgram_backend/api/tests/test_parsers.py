@@ -0,0 +1,23 @@
+from io import BytesIO
+
+from django.test import SimpleTestCase
+from rest_framework.parsers import JSONParser
+
+from api.parsers import FastJSONParser
+
+
+class FastJSONParserTest(SimpleTestCase):
+    def test_matches_json_parser(self):
+        for content in (
+            b'{"name": "\xd0\xa0\xd0\xb5\xd1\x86\xd0\xb5\xd0\xbf\xd1\x82",'
+            b' "cooking_time": 10, "tags": [1, 2]}',
+            b'{"amount": 123456789012345678901234567890}',
+            b'[-98765432109876543210, 1.5e20, 0.25]',
+            b'[1e400]',
+            b'{"text": "e1 1234 end"}',
+        ):
+            with self.subTest(content=content):
+                self.assertEqual(
+                    repr(FastJSONParser().parse(BytesIO(content))),
+                    repr(JSONParser().parse(BytesIO(content)))
+                )
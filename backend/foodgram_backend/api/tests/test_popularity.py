@@ -0,0 +1,105 @@
+from datetime import datetime, timezone
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from recipes.models import Recipe, User
+
+
+def at(year, month=1, day=1):
+    return mock.patch('django.utils.timezone.now', return_value=datetime(
+        year, month, day, tzinfo=timezone.utc
+    ))
+
+
+class PopularityTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create_user(
+                username=f'user{i}', email=f'user{i}@foodgram.ru',
+                password='password', first_name='Имя', last_name='Фамилия'
+            ) for i in range(3)
+        ]
+        cls.recipes = [
+            Recipe.objects.create(
+                author=cls.users[0], name=f'Рецепт {i}', text='Описание',
+                cooking_time=10, image='foodgram/recipe.png'
+            ) for i in range(2)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def get_popularity(self, recipe):
+        return Recipe.objects.get(pk=recipe.pk).popularity
+
+    def favourite(self, user, recipe):
+        self.client.force_authenticate(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/recipes/{recipe.pk}/favorite/')
+        self.assertEqual(response.status_code, 201)
+
+    def unfavourite(self, user, recipe):
+        self.client.force_authenticate(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(
+                f'/api/recipes/{recipe.pk}/favorite/'
+            )
+        self.assertEqual(response.status_code, 204)
+
+    def test_late_favourite_restores_previous_score(self):
+        recipe = self.recipes[0]
+        with at(2024, 3, 1):
+            self.favourite(self.users[0], recipe)
+        with at(2025, 6, 1):
+            self.favourite(self.users[1], recipe)
+        popularity = self.get_popularity(recipe)
+        for year in (2043, 2044, 2090):
+            with self.subTest(year=year), at(year, 9, 1):
+                self.favourite(self.users[2], recipe)
+                self.assertGreater(self.get_popularity(recipe), popularity)
+                self.unfavourite(self.users[2], recipe)
+                self.assertEqual(self.get_popularity(recipe), popularity)
+        self.unfavourite(self.users[1], recipe)
+        self.unfavourite(self.users[0], recipe)
+        self.assertEqual(self.get_popularity(recipe), 0)
+
+    def test_recent_favourites_rank_higher_and_match_recount(self):
+        old, recent = self.recipes
+        with at(2024, 1, 1):
+            self.favourite(self.users[0], old)
+            self.favourite(self.users[1], old)
+        with at(2024, 2, 1):
+            self.favourite(self.users[0], recent)
+        self.assertGreater(self.get_popularity(recent),
+                           self.get_popularity(old))
+        with at(2024, 2, 8):
+            self.unfavourite(self.users[0], old)
+        out = StringIO()
+        call_command('recount', stdout=out)
+        self.assertIn('Recipe.popularity: 0 rows fixed', out.getvalue())
+
+    def test_popular_ordering_is_not_served_stale(self):
+        first, second = self.recipes
+        self.favourite(self.users[0], first)
+        anonymous = APIClient()
+        params = {'ordering': 'popular'}
+        response = anonymous.get('/api/recipes/', params)
+        self.assertEqual(response.data['results'][0]['id'], first.pk)
+        viewer = APIClient()
+        viewer.force_authenticate(self.users[0])
+        etag = viewer.get('/api/recipes/', params)['ETag']
+        self.favourite(self.users[1], second)
+        self.favourite(self.users[2], second)
+        response = anonymous.get('/api/recipes/', params)
+        self.assertEqual(response.data['results'][0]['id'], second.pk)
+        response = viewer.get('/api/recipes/', params,
+                              HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['id'], second.pk)
@@ -0,0 +1,126 @@
+import base64
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from api.references import ingredient_cache
+from recipes.models import (Favourite, Follow, Ingredient, IngredientInRecipe,
+                            Recipe, ShoppingList, Tag, User)
+
+RECIPES_COUNT = 30
+RECIPE_LIST_QUERIES = 8
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_image():
+    buffer = BytesIO()
+    Image.new('RGB', (2, 2), 'red').save(buffer, 'PNG')
+    return 'data:image/png;base64,{}'.format(
+        base64.b64encode(buffer.getvalue()).decode()
+    )
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class RecipeQueriesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.tags = [
+            Tag.objects.create(name=f'Тег {i}', slug=f'tag-{i}',
+                               color=f'#00000{i}')
+            for i in range(3)
+        ]
+        Ingredient.objects.bulk_create(
+            Ingredient(name=f'Ингредиент {i}', measurement_unit='г')
+            for i in range(30)
+        )
+        cls.ingredients = list(Ingredient.objects.all())
+        cls.users = [
+            User.objects.create_user(
+                username=f'user{i}', email=f'user{i}@foodgram.ru',
+                password='password', first_name='Имя', last_name='Фамилия'
+            ) for i in range(5)
+        ]
+        cls.user = cls.users[0]
+        for author in cls.users[1:3]:
+            Follow.objects.create(user=cls.user, author=author)
+        for i in range(RECIPES_COUNT):
+            recipe = Recipe.objects.create(
+                author=cls.users[i % len(cls.users)], name=f'Рецепт {i}',
+                text='Описание', cooking_time=i + 1,
+                image='foodgram/recipe.png'
+            )
+            recipe.tags.set(cls.tags[:i % len(cls.tags) + 1])
+            IngredientInRecipe.objects.bulk_create(
+                IngredientInRecipe(recipe=recipe, ingredient=ingredient,
+                                   amount=amount + 1)
+                for amount, ingredient in enumerate(
+                    cls.ingredients[i:i + 3]
+                )
+            )
+            if i % 2:
+                Favourite.objects.create(user=cls.user, recipe=recipe)
+            if i % 3:
+                ShoppingList.objects.create(user=cls.user, recipe=recipe)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Token {}'.format(
+                Token.objects.create(user=self.user).key
+            )
+        )
+
+    def test_recipe_list_queries_do_not_depend_on_page_size(self):
+        for limit in (6, 20):
+            with self.subTest(limit=limit):
+                cache.clear()
+                with self.assertNumQueries(RECIPE_LIST_QUERIES):
+                    response = self.client.get(
+                        '/api/recipes/', {'limit': limit}
+                    )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data['results']), limit)
+
+    def test_recipe_create_queries_do_not_depend_on_ingredients(self):
+        queries = []
+        for count in (2, 12):
+            cache.clear()
+            ingredient_cache.get_objects()
+            Ingredient.objects.bulk_create(
+                Ingredient(name=f'Новый ингредиент {count}-{i}',
+                           measurement_unit='г')
+                for i in range(count)
+            )
+            ingredients = Ingredient.objects.filter(
+                name__startswith=f'Новый ингредиент {count}-'
+            )
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.post('/api/recipes/', {
+                    'name': f'Рецепт из {count} ингредиентов',
+                    'text': 'Описание',
+                    'cooking_time': 10,
+                    'image': make_image(),
+                    'tags': [tag.pk for tag in self.tags],
+                    'ingredients': [
+                        {'id': ingredient.pk, 'amount': 5}
+                        for ingredient in ingredients
+                    ],
+                }, format='json')
+            self.assertEqual(response.status_code, 201, response.data)
+            self.assertEqual(len(response.data['ingredients']), count)
+            queries.append(len(context))
+        self.assertEqual(queries[0], queries[1])
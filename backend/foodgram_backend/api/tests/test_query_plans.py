@@ -0,0 +1,126 @@
+import re
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from recipes.models import (Favourite, Follow, Ingredient, IngredientInRecipe,
+                            Recipe, ShoppingList, Tag, User)
+
+EXPLAIN = {
+    'sqlite': ('EXPLAIN QUERY PLAN ', -1,
+               re.compile(r'^SCAN (?:TABLE )?(\w+)$')),
+    'postgresql': ('EXPLAIN ', 0, re.compile(r'Seq Scan on (\w+)')),
+}
+REFERENCE_TABLES = {Tag._meta.db_table, Ingredient._meta.db_table}
+RECIPE_FILTERS = (
+    {},
+    {'tags': 'tag-0'},
+    {'tags': ['tag-0', 'tag-1']},
+    {'author': 'author'},
+    {'is_favorited': 1},
+    {'is_in_shopping_cart': 1},
+    {'ordering': 'popular'},
+    {'ordering': 'quick'},
+    {'cursor': ''},
+    {'cursor': '', 'ordering': 'popular'},
+    {'tags': 'tag-1', 'author': 'author'},
+    {'tags': 'tag-1', 'is_favorited': 1, 'ordering': 'quick'},
+    {'author': 'author', 'is_in_shopping_cart': 1},
+    {'fields': 'id,name'},
+)
+
+
+class QueryPlanTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        tags = [
+            Tag.objects.create(name=f'Тег {i}', slug=f'tag-{i}',
+                               color=f'#00000{i}')
+            for i in range(3)
+        ]
+        Ingredient.objects.bulk_create(
+            Ingredient(name=f'Ингредиент {i}', measurement_unit='г')
+            for i in range(50)
+        )
+        ingredients = list(Ingredient.objects.all())
+        users = [
+            User.objects.create_user(
+                username=f'user{i}', email=f'user{i}@foodgram.ru',
+                password='password', first_name='Имя', last_name='Фамилия'
+            ) for i in range(10)
+        ]
+        cls.user, cls.author = users[:2]
+        for author in users[1:5]:
+            Follow.objects.create(user=cls.user, author=author)
+        for i in range(200):
+            recipe = Recipe.objects.create(
+                author=users[i % len(users)], name=f'Рецепт {i}',
+                text='Описание', cooking_time=i % 60 + 1,
+                image='foodgram/recipe.png'
+            )
+            recipe.tags.set(tags[i % len(tags):])
+            IngredientInRecipe.objects.bulk_create(
+                IngredientInRecipe(recipe=recipe, ingredient=ingredient,
+                                   amount=i + 1)
+                for ingredient in ingredients[i % 40:i % 40 + 5]
+            )
+            if i % 4 == 0:
+                Favourite.objects.create(user=cls.user, recipe=recipe)
+            if i % 5 == 0:
+                ShoppingList.objects.create(user=cls.user, recipe=recipe)
+
+    def setUp(self):
+        if connection.vendor not in EXPLAIN:
+            self.skipTest(f'EXPLAIN is not checked on {connection.vendor}')
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+
+    def get_plans(self, url, params=None):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, 200)
+        prefix, column, _ = EXPLAIN[connection.vendor]
+        plans = []
+        for query in queries.captured_queries:
+            if not query['sql'].startswith('SELECT'):
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute(prefix + query['sql'])
+                plans.append((query['sql'], [
+                    row[column] for row in cursor.fetchall()
+                ]))
+        return plans
+
+    def assertNoSequentialScans(self, url, params=None):
+        pattern = EXPLAIN[connection.vendor][2]
+        for sql, plan in self.get_plans(url, params):
+            for line in plan:
+                match = pattern.search(line)
+                if match and match[1] not in REFERENCE_TABLES:
+                    self.fail('Sequential scan on {}:\n{}\n{}'.format(
+                        match[1], sql, '\n'.join(plan)
+                    ))
+
+    def test_recipe_filters_use_indexes(self):
+        for params in RECIPE_FILTERS:
+            if params.get('author') == 'author':
+                params = {**params, 'author': self.author.pk}
+            with self.subTest(**params):
+                self.assertNoSequentialScans('/api/recipes/', params)
+
+    def test_user_pages_use_indexes(self):
+        for url in ('/api/users/subscriptions/', '/api/users/me/state/',
+                    f'/api/recipes/{Recipe.objects.first().pk}/',
+                    '/api/recipes/download_shopping_cart/'):
+            with self.subTest(url=url):
+                self.assertNoSequentialScans(url)
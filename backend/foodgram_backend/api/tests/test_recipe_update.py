@@ -0,0 +1,107 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from recipes.models import Ingredient, IngredientInRecipe, Recipe, Tag, User
+
+
+class RecipeUpdateTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='user', email='user@foodgram.ru', password='password',
+            first_name='Имя', last_name='Фамилия'
+        )
+        cls.tags = [
+            Tag.objects.create(name=f'Тег {i}', slug=f'tag-{i}',
+                               color=f'#00000{i}')
+            for i in range(3)
+        ]
+        Ingredient.objects.bulk_create(
+            Ingredient(name=f'Ингредиент {i}', measurement_unit='г')
+            for i in range(20)
+        )
+        cls.ingredients = list(Ingredient.objects.order_by('pk'))
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Token {}'.format(
+                Token.objects.create(user=self.user).key
+            )
+        )
+
+    def create_recipe(self, ingredients_count):
+        recipe = Recipe.objects.create(
+            author=self.user, name='Рецепт', text='Описание',
+            cooking_time=10, image='foodgram/recipe.png'
+        )
+        recipe.tags.set(self.tags[:2])
+        IngredientInRecipe.objects.bulk_create(
+            IngredientInRecipe(recipe=recipe, ingredient=ingredient,
+                               amount=i + 1)
+            for i, ingredient in enumerate(
+                self.ingredients[:ingredients_count]
+            )
+        )
+        return recipe
+
+    def get_rows(self, recipe):
+        return {
+            row.ingredient_id: (row.pk, row.amount)
+            for row in IngredientInRecipe.objects.filter(recipe=recipe)
+        }
+
+    def patch(self, recipe, amounts, tags):
+        return self.client.patch(
+            f'/api/recipes/{recipe.pk}/',
+            {'tags': [tag.pk for tag in tags], 'ingredients': [
+                {'id': ingredient.pk, 'amount': amount}
+                for ingredient, amount in amounts.items()
+            ]},
+            format='json'
+        )
+
+    def test_update_keeps_unchanged_rows(self):
+        recipe = self.create_recipe(3)
+        kept, changed, removed = self.ingredients[:3]
+        added = self.ingredients[3]
+        rows = self.get_rows(recipe)
+        response = self.patch(recipe, {kept: 1, changed: 7, added: 4},
+                              self.tags[1:])
+        self.assertEqual(response.status_code, 200)
+        updated_rows = self.get_rows(recipe)
+        self.assertEqual(updated_rows[kept.pk], rows[kept.pk])
+        self.assertEqual(updated_rows[changed.pk],
+                         (rows[changed.pk][0], 7))
+        self.assertNotIn(removed.pk, updated_rows)
+        self.assertEqual(updated_rows[added.pk][1], 4)
+        self.assertFalse(IngredientInRecipe.objects.filter(
+            pk=rows[removed.pk][0]
+        ).exists())
+        self.assertEqual(
+            set(recipe.tags.values_list('pk', flat=True)),
+            {tag.pk for tag in self.tags[1:]}
+        )
+
+    def test_update_queries_do_not_grow_with_ingredients(self):
+        self.patch(self.create_recipe(1), {self.ingredients[0]: 1},
+                   self.tags)
+        for ingredients_count in (3, 15):
+            recipe = self.create_recipe(ingredients_count)
+            amounts = {
+                ingredient: i + 1 for i, ingredient in enumerate(
+                    self.ingredients[:ingredients_count]
+                )
+            }
+            first, second, removed = self.ingredients[:3]
+            amounts[first] = 50
+            amounts[second] = 60
+            del amounts[removed]
+            amounts[self.ingredients[ingredients_count]] = 1
+            with self.subTest(ingredients_count=ingredients_count), \
+                    self.assertNumQueries(17):
+                response = self.patch(recipe, amounts, self.tags[1:])
+            self.assertEqual(response.status_code, 200)
@@ -0,0 +1,51 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api.references import tag_cache
+from api.search import ingredient_index
+from recipes.models import Ingredient, Tag
+
+
+@override_settings(REFERENCE_CACHE_TIMEOUT=30)
+class ReferenceCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def later(self, seconds):
+        return mock.patch('time.monotonic',
+                          return_value=time.monotonic() + seconds)
+
+    def test_rows_added_elsewhere_appear_after_timeout(self):
+        Tag.objects.create(name='Завтрак', slug='breakfast', color='#000001')
+        Ingredient.objects.create(name='Соль', measurement_unit='г')
+        self.assertEqual(
+            self.client.get('/api/recipes/', {'tags': 'lunch'}).status_code,
+            400
+        )
+        self.client.get('/api/ingredients/', {'name': 'пер'})
+        Tag.objects.bulk_create(
+            [Tag(name='Обед', slug='lunch', color='#000002')]
+        )
+        Ingredient.objects.bulk_create(
+            [Ingredient(name='Перец', measurement_unit='г')]
+        )
+        self.assertNotIn('lunch', tag_cache.get_lookup('slug'))
+        self.assertEqual(ingredient_index.search('пер'), [])
+        with self.later(31):
+            self.assertEqual(
+                self.client.get(
+                    '/api/recipes/', {'tags': 'lunch'}
+                ).status_code,
+                200
+            )
+            self.assertEqual(
+                self.client.get(
+                    '/api/ingredients/', {'name': 'пер'}
+                ).json()[0]['name'],
+                'Перец'
+            )
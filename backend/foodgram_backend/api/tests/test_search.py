@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from recipes.models import Ingredient
+
+
+@override_settings(INGREDIENT_SEARCH_INDEX=True, REFERENCE_CACHE_TIMEOUT=3600,
+                   INGREDIENT_SEARCH_SIMILARITY=0.3)
+class IngredientSearchTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def search(self, name, **params):
+        response = self.client.get('/api/ingredients/',
+                                   {'name': name, **params})
+        self.assertEqual(response.status_code, 200)
+        return [row['name'] for row in response.json()]
+
+    def test_index_follows_ingredient_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ingredient = Ingredient.objects.create(name='Соль',
+                                                   measurement_unit='г')
+        self.assertEqual(self.search('сол'), ['Соль'])
+        self.assertEqual(self.search('пер'), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            ingredient.name = 'Перец'
+            ingredient.save()
+        self.assertEqual(self.search('сол'), [])
+        self.assertEqual(self.search('пер'), ['Перец'])
+        with self.captureOnCommitCallbacks(execute=True):
+            Ingredient.objects.create(name='Перец чили',
+                                      measurement_unit='г')
+        self.assertEqual(self.search('пер'), ['Перец', 'Перец чили'])
+        with self.captureOnCommitCallbacks(execute=True):
+            ingredient.delete()
+        self.assertEqual(self.search('пер'), ['Перец чили'])
+
+    def test_ranked_search_puts_prefix_matches_first(self):
+        Ingredient.objects.bulk_create(
+            Ingredient(name=name, measurement_unit='г')
+            for name in ('Сахор', 'Ванильный сахар', 'Цукаты',
+                         'Сахарная пудра', 'Сахар')
+        )
+        self.assertEqual(
+            self.search('сахар', search_mode='ranked'),
+            ['Сахар', 'Сахарная пудра', 'Ванильный сахар', 'Сахор']
+        )
+        self.assertEqual(self.search('сахар'), ['Сахар', 'Сахарная пудра'])
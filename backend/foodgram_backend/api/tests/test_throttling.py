@@ -0,0 +1,103 @@
+import math
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from api.throttling import SlidingWindowAnonRateThrottle
+
+
+class FivePerMinuteThrottle(SlidingWindowAnonRateThrottle):
+    rate = '5/min'
+
+
+class SlidingWindowThrottleTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = APIRequestFactory().get('/api/recipes/')
+        self.request.user = AnonymousUser()
+
+    def allow_at(self, now):
+        throttle = FivePerMinuteThrottle()
+        throttle.timer = lambda: now
+        return throttle.allow_request(self.request, None), throttle
+
+    def assertRetryAfterIsExact(self, now):
+        allowed, throttle = self.allow_at(now)
+        self.assertFalse(allowed)
+        retry_at = now + math.ceil(throttle.wait())
+        self.assertFalse(self.allow_at(retry_at - 1)[0])
+        self.assertTrue(self.allow_at(retry_at)[0])
+
+    def test_retry_after_when_current_window_is_full(self):
+        for now in range(610, 615):
+            self.assertTrue(self.allow_at(now)[0])
+        self.assertRetryAfterIsExact(630)
+
+    def test_retry_after_while_previous_window_decays(self):
+        for now in range(540, 545):
+            self.assertTrue(self.allow_at(now)[0])
+        self.assertRetryAfterIsExact(601)
+
+    def test_retry_after_with_both_windows_in_use(self):
+        for now in (550, 551, 552, 610, 611):
+            self.assertTrue(self.allow_at(now)[0])
+        self.assertRetryAfterIsExact(612)
+
+
+class ThrottleCounterTest(SimpleTestCase):
+    def test_file_cache_counter_does_not_lose_hits(self):
+        get = FileBasedCache.get
+
+        def slow_get(*args, **kwargs):
+            value = get(*args, **kwargs)
+            time.sleep(0.002)
+            return value
+
+        throttle = FivePerMinuteThrottle()
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+            CACHES={'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.'
+                           'FileBasedCache',
+                'LOCATION': directory,
+            }}
+        ), mock.patch.object(FileBasedCache, 'get', slow_get), \
+                ThreadPoolExecutor(8) as executor:
+            list(executor.map(
+                lambda _: throttle.update_counter('hits', 1), range(40)
+            ))
+            self.assertEqual(cache.get('hits'), 40)
+
+
+@override_settings(CACHES={'default': {
+    'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+    'LOCATION': 'throttle_cache',
+    'TIMEOUT': 1,
+}})
+class DatabaseThrottleCounterTest(TestCase):
+    def setUp(self):
+        call_command('createcachetable', verbosity=0)
+
+    def test_counter_keeps_window_timeout(self):
+        throttle = FivePerMinuteThrottle()
+        self.assertEqual(throttle.update_counter('hits', 1), 1)
+        self.assertEqual(throttle.update_counter('hits', 1), 2)
+        self.assertEqual(throttle.update_counter('hits', -1), 1)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT expires FROM throttle_cache')
+            expires = cursor.fetchone()[0]
+        if isinstance(expires, str):
+            expires = datetime.fromisoformat(expires)
+        self.assertGreater(
+            expires.replace(tzinfo=None),
+            datetime.utcnow() + timedelta(seconds=throttle.duration)
+        )
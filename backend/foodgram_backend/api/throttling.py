@@ -0,0 +1,92 @@
+import fcntl
+import os
+from contextlib import contextmanager
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.db import connections, router, transaction
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+COUNTER_LOCK_FILE = 'throttle.lock'
+
+
+@contextmanager
+def counter_lock(backend, key):
+    if backend is cache:
+        backend = caches[DEFAULT_CACHE_ALIAS]
+    if isinstance(backend, FileBasedCache):
+        with open(os.path.join(backend._dir, COUNTER_LOCK_FILE), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield True
+    elif isinstance(backend, DatabaseCache):
+        db = router.db_for_write(backend.cache_model_class)
+        connection = connections[db]
+        with transaction.atomic(using=db):
+            if connection.features.has_select_for_update:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        'SELECT cache_key FROM {} WHERE cache_key = %s '
+                        'FOR UPDATE'.format(
+                            connection.ops.quote_name(backend._table)
+                        ),
+                        [backend.make_key(key)]
+                    )
+            yield True
+    else:
+        yield False
+
+
+class SlidingWindowThrottleMixin:
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        now = self.timer()
+        window, offset = divmod(now, self.duration)
+        current_key = f'{self.key}:{int(window)}'
+        previous = self.cache.get(f'{self.key}:{int(window) - 1}', 0)
+        current = self.update_counter(current_key, 1)
+        weight = 1 - offset / self.duration
+        if previous * weight + current <= self.num_requests:
+            return True
+        self.update_counter(current_key, -1)
+        self.wait_time = round(
+            self.get_wait_time(previous, current - 1, offset), 6
+        )
+        return False
+
+    def update_counter(self, key, delta):
+        self.cache.add(key, 0, 2 * self.duration)
+        with counter_lock(self.cache, key) as locked:
+            if not locked:
+                try:
+                    return self.cache.incr(key, delta)
+                except ValueError:
+                    pass
+            value = max(self.cache.get(key, 0) + delta, 0)
+            self.cache.set(key, value, 2 * self.duration)
+            return value
+
+    def get_wait_time(self, previous, current, offset):
+        remaining = self.num_requests - 1
+        if current <= remaining:
+            return self.duration * (
+                1 - (remaining - current) / previous
+            ) - offset
+        return self.duration * (2 - remaining / current) - offset
+
+    def wait(self):
+        return self.wait_time
+
+
+class SlidingWindowUserRateThrottle(SlidingWindowThrottleMixin,
+                                    UserRateThrottle):
+    pass
+
+
+class SlidingWindowAnonRateThrottle(SlidingWindowThrottleMixin,
+                                    AnonRateThrottle):
+    pass
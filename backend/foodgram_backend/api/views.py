@@ -1,16 +1,27 @@
 from http import HTTPStatus
 
-from django.db.models import Exists, OuterRef, Sum
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import (Exists, OuterRef, Prefetch, Subquery, Sum,
+                              Value)
 from django.http import FileResponse
+from django.views.decorators.http import condition
 from django_filters.rest_framework import DjangoFilterBackend
 from djoser.views import UserViewSet
 from rest_framework import filters, permissions, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
-from .filters import RecipeFilter
+from .cache import (AnonymousCacheMixin, ConditionalGetMixin, get_generation,
+                    user_generation)
+from .const import MIN_VALUE, SHOPPING_CART_CHUNK_SIZE
+from .exports import SHOPPING_CART_EXPORTS, SHOPPING_CART_RENDERERS
+from .filters import ORDERINGS, RecipeFilter
 from .pagination import CustomPagination
 from .permissions import IsAuthorAdminOrReadOnly
+from .search import IngredientSearchMixin
 from .serializers import (IngredientSerializer, FavouriteCreateSerializer,
                           FollowSerializer, FoodgramUserSerializer,
                           FollowCreateSerializer, RecipeCreateSerializer,
@@ -19,31 +30,118 @@ from .serializers import (IngredientSerializer, FavouriteCreateSerializer,
 from recipes.models import (Ingredient, IngredientInRecipe, Favourite, Follow,
                             Recipe, ShoppingList, Tag, User)
 
+RECIPE_COLUMNS = {
+    'author': ('author',),
+    'tags': (),
+    'ingredients': (),
+    'is_favorited': (),
+    'is_in_shopping_cart': (),
+    'name': ('name',),
+    'image': ('image', 'image_card'),
+    'images': ('image', 'image_thumbnail', 'image_card', 'image_full'),
+    'text': ('text',),
+    'cooking_time': ('cooking_time',),
+}
+
+
+def annotate_is_subscribed(queryset, user):
+    if not user.is_authenticated:
+        return queryset
+    return queryset.annotate(is_subscribed=Exists(
+        Follow.objects.filter(user=user, author=OuterRef('pk'))
+    ))
+
+
+def get_user_state(user):
+    generation = get_generation(user_generation(user.pk))
+    key = f'state:{user.pk}:{generation}'
+    state = cache.get(key)
+    if state is None:
+        state = {'favorites': [], 'shopping_cart': [], 'subscriptions': []}
+        for name, pk in Favourite.objects.filter(user=user).values_list(
+            Value('favorites'), 'recipe_id'
+        ).union(
+            ShoppingList.objects.filter(user=user).values_list(
+                Value('shopping_cart'), 'recipe_id'
+            ),
+            Follow.objects.filter(user=user).values_list(
+                Value('subscriptions'), 'author_id'
+            ),
+            all=True
+        ):
+            state[name].append(pk)
+        for ids in state.values():
+            ids.sort()
+        cache.set(key, state, settings.API_CACHE_TIMEOUT)
+    return generation, state
+
 
 class FoodgramUserViewSet(UserViewSet):
     queryset = User.objects.all()
     serializer_class = FoodgramUserSerializer
     pagination_class = CustomPagination
+    cursor_ordering = ('username', 'id')
     http_method_names = ('get', 'post', 'delete')
 
+    def get_queryset(self):
+        return annotate_is_subscribed(super().get_queryset(),
+                                      self.request.user)
+
     def get_permissions(self):
         if self.action == 'me':
             return (permissions.IsAuthenticated(),)
         return super().get_permissions()
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action in ('subscriptions', 'subscribe'):
+            context['recipes_limit'] = self.get_recipes_limit()
+        return context
+
+    def get_recipes_limit(self):
+        recipes_limit = self.request.query_params.get('recipes_limit')
+        if recipes_limit is None:
+            return None
+        if not recipes_limit.isdecimal() or int(recipes_limit) < MIN_VALUE:
+            raise ValidationError({
+                'recipes_limit': 'Значение recipes_limit должно быть '
+                                 'целым положительным числом.'
+            })
+        return int(recipes_limit)
+
     @action(['GET'], detail=False, url_path='subscriptions',
             permission_classes=(permissions.IsAuthenticated,))
     def subscriptions(self, request):
+        context = self.get_serializer_context()
+        recipes = Recipe.objects.all()
+        if context['recipes_limit']:
+            recipes = recipes.filter(pk__in=Subquery(
+                Recipe.objects.filter(
+                    author=OuterRef('author')
+                ).values('pk')[:context['recipes_limit']]
+            ))
+        queryset = self.get_queryset().filter(
+            author__user=request.user
+        ).prefetch_related(
+            Prefetch('recipes', queryset=recipes, to_attr='limited_recipes')
+        )
         serializer = FollowSerializer(
-            self.paginate_queryset(
-                User.objects.filter(author__user=request.user)
-            ),
-            many=True, context=self.get_serializer_context()
+            self.paginate_queryset(queryset),
+            many=True, context=context
         )
         return self.get_paginated_response(serializer.data)
 
+    @action(['GET'], detail=False, url_path='me/state',
+            permission_classes=(permissions.IsAuthenticated,))
+    def state(self, request):
+        generation, state = get_user_state(request.user)
+        return condition(
+            etag_func=lambda request: f'{request.user.pk}-{generation}'
+        )(lambda request: Response(state))(request)
+
     @action(['POST'], detail=True, url_path='subscribe',
             permission_classes=(permissions.IsAuthenticated,))
+    @transaction.atomic
     def subscribe(self, request, id):
         serializer = FollowCreateSerializer(
             data={'user': request.user.id,
@@ -64,44 +162,102 @@ class FoodgramUserViewSet(UserViewSet):
         return Response(status=HTTPStatus.BAD_REQUEST)
 
 
-class TagViewSet(viewsets.ReadOnlyModelViewSet):
+class TagViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     pagination_class = None
+    condition_generations = ('tags',)
 
 
-class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
+class IngredientViewSet(ConditionalGetMixin, IngredientSearchMixin,
+                        viewsets.ReadOnlyModelViewSet):
     queryset = Ingredient.objects.all()
     serializer_class = IngredientSerializer
     pagination_class = None
+    condition_generations = ('ingredients',)
     filter_backends = (filters.SearchFilter,)
     search_fields = ('^name',)
 
 
-class RecipeViewSet(viewsets.ModelViewSet):
+class RecipeViewSet(ConditionalGetMixin, AnonymousCacheMixin,
+                    viewsets.ModelViewSet):
     pagination_class = CustomPagination
     permission_classes = (IsAuthorAdminOrReadOnly,)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = RecipeFilter
+    cache_generation = 'recipes'
+    cache_query_params = ('page', 'limit', 'tags', 'author', 'ordering',
+                          'cursor', 'fields', 'expand')
+    cursor_ordering = ('-pub_date', '-id')
+    condition_generations = ('recipes',)
+    condition_per_user = True
 
-    def get_queryset(self):
-        queryset = Recipe.objects.select_related('author').prefetch_related(
-            'ingredients', 'tags'
-        )
-        if self.request.user.is_authenticated:
-            user = self.request.user
-            is_favorited = Recipe.objects.filter(
-                is_fav__recipe=OuterRef('pk'),
-                is_fav__user=user
-            )
-            is_in_shopping_cart = Recipe.objects.filter(
-                is_in_shop_cart__recipe=OuterRef('pk'),
-                is_in_shop_cart__user=user
+    def get_sparse_fields(self):
+        if self.action not in ('list', 'retrieve'):
+            return None
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = RecipeSerializer.parse_sparse_fields(
+                self.request.query_params
             )
-            return queryset.annotate(
-                is_favorited=Exists(is_favorited),
-                is_in_shopping_cart=Exists(is_in_shopping_cart)
+        return self._sparse_fields
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['sparse_fields'] = self.get_sparse_fields()
+        return context
+
+    def get_cursor_ordering(self):
+        ordering = self.request.query_params.get('ordering')
+        if ordering in ORDERINGS:
+            return (*ORDERINGS[ordering], '-id')
+        return self.cursor_ordering
+
+    def is_popularity_ordering(self):
+        return '-popularity' in self.get_cursor_ordering()
+
+    def get_cache_key(self, request):
+        key = super().get_cache_key(request)
+        if self.is_popularity_ordering():
+            return f'{key}:{get_generation("popularity")}'
+        return key
+
+    def get_condition_generations(self, request):
+        generations = super().get_condition_generations(request)
+        if self.is_popularity_ordering():
+            generations.append(get_generation('popularity'))
+        return generations
+
+    def get_queryset(self):
+        user = self.request.user
+        sparse_fields = self.get_sparse_fields()
+        fields, expand = sparse_fields or (RECIPE_COLUMNS, RECIPE_COLUMNS)
+        queryset = Recipe.objects.all()
+        if sparse_fields is not None:
+            queryset = queryset.only(*(
+                field.lstrip('-') for field in self.get_cursor_ordering()
+            ), *(
+                column for field in fields
+                for column in RECIPE_COLUMNS.get(field, ())
+            ))
+        if 'author' in fields and 'author' in expand:
+            queryset = queryset.prefetch_related(Prefetch(
+                'author',
+                queryset=annotate_is_subscribed(User.objects.all(), user)
+            ))
+        if 'ingredients' in fields:
+            queryset = queryset.prefetch_related('ingredient_in_recipe')
+        if 'tags' in fields:
+            queryset = queryset.prefetch_related(
+                Prefetch('tags', queryset=Tag.objects.only('id'))
             )
+        if user.is_authenticated and 'is_favorited' in fields:
+            queryset = queryset.annotate(is_favorited=Exists(
+                Favourite.objects.filter(user=user, recipe=OuterRef('pk'))
+            ))
+        if user.is_authenticated and 'is_in_shopping_cart' in fields:
+            queryset = queryset.annotate(is_in_shopping_cart=Exists(
+                ShoppingList.objects.filter(user=user, recipe=OuterRef('pk'))
+            ))
         return queryset
 
     def get_serializer_class(self):
@@ -109,6 +265,7 @@ class RecipeViewSet(viewsets.ModelViewSet):
             return RecipeCreateSerializer
         return RecipeSerializer
 
+    @transaction.atomic
     def add_recipe_in_favorite_or_shopping_list(self, serializer, pk, request):
         serializer = serializer(
             data={'user': request.user.pk,
@@ -151,24 +308,26 @@ class RecipeViewSet(viewsets.ModelViewSet):
             return Response(status=HTTPStatus.NO_CONTENT)
         return Response(status=HTTPStatus.BAD_REQUEST)
 
-    def shopping_list(self, ingredients):
-        shopping_list_for_txt = 'Список покупок:\n'
-        for ingredient in ingredients:
-            name = ingredient['ingredient__name']
-            amount = ingredient['amount__sum']
-            measurement_unit = ingredient['ingredient__measurement_unit']
-            shopping_list_for_txt += f'{name} - {amount} {measurement_unit}\n'
-        return shopping_list_for_txt
-
     @action(['GET'], detail=False, url_path='download_shopping_cart',
-            permission_classes=(permissions.IsAuthenticated,))
+            permission_classes=(permissions.IsAuthenticated,),
+            renderer_classes=SHOPPING_CART_RENDERERS)
     def download_shopping_cart(self, request):
         ingredients = IngredientInRecipe.objects.filter(
             recipe__is_in_shop_cart__user=request.user
-        ).values(
+        ).values_list(
             'ingredient__name', 'ingredient__measurement_unit'
         ).order_by('ingredient__name').annotate(Sum('amount'))
-        return FileResponse(self.shopping_list(ingredients), headers={
-            'Content-Type': 'application/txt',
-            'Content-Disposition': 'attachment; filename="shopping_cart.txt"',
-        })
+        renderer = request.accepted_renderer
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        filename = f'shopping_cart.{renderer.format}'
+        return FileResponse(
+            SHOPPING_CART_EXPORTS[renderer.format](
+                ingredients.iterator(chunk_size=SHOPPING_CART_CHUNK_SIZE)
+            ),
+            content_type=content_type,
+            headers={
+                'Content-Disposition': f'attachment; filename="{filename}"'
+            }
+        )
@@ -0,0 +1,56 @@
+import os
+import statistics
+import time
+from argparse import ArgumentParser
+from contextlib import contextmanager
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'foodgram_backend.settings')
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import (setup_test_environment,  # noqa: E402
+                               teardown_test_environment)
+
+
+def get_parser(description, **defaults):
+    parser = ArgumentParser(description=description)
+    for name, default in defaults.items():
+        parser.add_argument(f'--{name.replace("_", "-")}', type=int,
+                            default=default)
+    return parser
+
+
+@contextmanager
+def benchmark_database():
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    cache.clear()
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def measure(function, repeat):
+    function()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def report(title, rows):
+    print(title)
+    width = max(len(name) for name, *_ in rows)
+    for name, *values in rows:
+        print('  {}  {}'.format(name.ljust(width), '  '.join(
+            f'{value:10.3f}' if isinstance(value, float) else f'{value:>10}'
+            for value in values
+        )))
@@ -0,0 +1,88 @@
+import base64
+import os
+from io import BytesIO
+
+from benchmarks.common import (benchmark_database, get_parser, measure,
+                               report)
+from benchmarks.serializers import get_list_view, seed
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from api.parsers import FastJSONParser  # noqa: E402
+from api.renderers import FastJSONRenderer, orjson  # noqa: E402
+from api.serializers import RecipeSerializer  # noqa: E402
+
+
+def get_recipe_list(recipes_count):
+    view = get_list_view(seed(recipes_count))
+    return {
+        'count': recipes_count, 'next': None, 'previous': None,
+        'results': RecipeSerializer(
+            view.get_queryset().order_by('-id'), many=True,
+            context=view.get_serializer_context()
+        ).data,
+    }
+
+
+def get_shopping_cart(ingredients_count):
+    return [
+        {'name': f'Ингредиент {i}', 'amount': i * 10 + 1,
+         'measurement_unit': 'г'}
+        for i in range(ingredients_count)
+    ]
+
+
+def get_upload(size):
+    return {
+        'name': 'Рецепт', 'text': 'Описание', 'cooking_time': 10,
+        'tags': [1, 2], 'ingredients': [{'id': 1, 'amount': 10}],
+        'image': 'data:image/png;base64,{}'.format(
+            base64.b64encode(os.urandom(size)).decode()
+        ),
+    }
+
+
+def main():
+    options = get_parser(
+        'JSONRenderer and JSONParser against the orjson fast path',
+        recipes=50, cart_items=2000, upload_kb=1024, repeat=50
+    ).parse_args()
+    if orjson is None:
+        raise SystemExit('orjson is not installed')
+    with benchmark_database():
+        payloads = {
+            f'{options.recipes} recipes': get_recipe_list(options.recipes),
+            f'cart, {options.cart_items} items': get_shopping_cart(
+                options.cart_items
+            ),
+            f'upload, {options.upload_kb} KB': get_upload(
+                options.upload_kb * 1024
+            ),
+        }
+    render_rows, parse_rows = [], []
+    for name, data in payloads.items():
+        content = JSONRenderer().render(data)
+        assert FastJSONRenderer().render(data) == content
+        parsed = JSONParser().parse(BytesIO(content))
+        assert FastJSONParser().parse(BytesIO(content)) == parsed
+        drf, fast = (
+            measure(lambda: renderer().render(data), options.repeat)
+            for renderer in (JSONRenderer, FastJSONRenderer)
+        )
+        render_rows.append((name, len(content) // 1024, drf, fast,
+                            drf / fast))
+        drf, fast = (
+            measure(lambda: parser().parse(BytesIO(content)),
+                    options.repeat)
+            for parser in (JSONParser, FastJSONParser)
+        )
+        parse_rows.append((name, len(content) // 1024, drf, fast,
+                           drf / fast))
+    report('Render, median ms: KB, JSONRenderer, FastJSONRenderer, '
+           'speedup', render_rows)
+    report('Parse, median ms: KB, JSONParser, FastJSONParser, speedup',
+           parse_rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+import json
+
+from benchmarks.common import (benchmark_database, get_parser, measure,
+                               report)
+from django.test import override_settings  # noqa: E402
+from rest_framework.test import (APIRequestFactory,  # noqa: E402
+                                 force_authenticate)
+
+from api.serializers import RecipeSerializer  # noqa: E402
+from api.views import RecipeViewSet  # noqa: E402
+from recipes.models import (Favourite, Follow, Ingredient,  # noqa: E402
+                            IngredientInRecipe, Recipe, ShoppingList, Tag,
+                            User)
+
+SIZES = (6, 50, 200)
+
+
+def seed(recipes_count, ingredients_per_recipe=8):
+    tags = [Tag.objects.create(name=f'Тег {i}', slug=f'tag-{i}',
+                               color=f'#00000{i}') for i in range(5)]
+    Ingredient.objects.bulk_create(
+        Ingredient(name=f'Ингредиент {i}', measurement_unit='г')
+        for i in range(200)
+    )
+    ingredients = list(Ingredient.objects.all())
+    authors = [
+        User.objects.create_user(
+            username=f'author{i}', email=f'author{i}@foodgram.ru',
+            first_name='Имя', last_name='Фамилия'
+        ) for i in range(20)
+    ]
+    user = authors[0]
+    Follow.objects.bulk_create(Follow(user=user, author=author)
+                               for author in authors[1:10])
+    Recipe.objects.bulk_create(
+        Recipe(author=authors[i % len(authors)], name=f'Рецепт {i}',
+               text='Описание ' * 20, cooking_time=i % 120 + 1,
+               image='foodgram/recipe.png')
+        for i in range(recipes_count)
+    )
+    recipes = list(Recipe.objects.all())
+    Recipe.tags.through.objects.bulk_create(
+        Recipe.tags.through(recipe_id=recipe.pk, tag_id=tag.pk)
+        for i, recipe in enumerate(recipes)
+        for tag in tags[i % len(tags):][:2]
+    )
+    IngredientInRecipe.objects.bulk_create(
+        IngredientInRecipe(recipe=recipe, ingredient=ingredient,
+                           amount=i + 1)
+        for i, recipe in enumerate(recipes)
+        for ingredient in ingredients[i % 100:][:ingredients_per_recipe]
+    )
+    Favourite.objects.bulk_create(Favourite(user=user, recipe=recipe)
+                                  for recipe in recipes[::3])
+    ShoppingList.objects.bulk_create(ShoppingList(user=user, recipe=recipe)
+                                     for recipe in recipes[::4])
+    return user
+
+
+def get_list_view(user):
+    request = APIRequestFactory().get('/api/recipes/')
+    force_authenticate(request, user)
+    view = RecipeViewSet(action_map={'get': 'list'}, format_kwarg=None,
+                         args=(), kwargs={})
+    view.request = view.initialize_request(request)
+    return view
+
+
+def serialize(recipes, context, fast):
+    with override_settings(FAST_SERIALIZERS=fast):
+        return RecipeSerializer(recipes, many=True, context=context).data
+
+
+def main():
+    options = get_parser(
+        'Recipe list serialization, FAST_SERIALIZERS vs DRF fields',
+        repeat=20
+    ).parse_args()
+    with benchmark_database():
+        view = get_list_view(seed(max(SIZES)))
+        context = view.get_serializer_context()
+        rows = []
+        for size in SIZES:
+            recipes = list(view.get_queryset().order_by('-id')[:size])
+            assert (json.dumps(serialize(recipes, context, True))
+                    == json.dumps(serialize(recipes, context, False)))
+            drf, fast = (
+                measure(lambda: serialize(recipes, context, fast),
+                        options.repeat)
+                for fast in (False, True)
+            )
+            rows.append((f'{size} recipes', drf, fast, drf / fast))
+        report('Median ms: DRF fields, fast path, speedup', rows)
+
+
+if __name__ == '__main__':
+    main()
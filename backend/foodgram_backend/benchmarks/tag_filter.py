@@ -0,0 +1,74 @@
+from benchmarks.common import (benchmark_database, get_parser, measure,
+                               report)
+from django.http import QueryDict  # noqa: E402
+from django_filters import (FilterSet,  # noqa: E402
+                            ModelMultipleChoiceFilter)
+
+from api.filters import RecipeFilter  # noqa: E402
+from recipes.models import Recipe, Tag, User  # noqa: E402
+
+TAGS = ('breakfast', 'lunch', 'dinner', 'dessert', 'drinks')
+
+
+class JoinRecipeFilter(FilterSet):
+    tags = ModelMultipleChoiceFilter(queryset=Tag.objects.all(),
+                                     field_name='tags__slug',
+                                     to_field_name='slug')
+
+    class Meta:
+        model = Recipe
+        fields = ('author',)
+
+
+def seed(recipes_count, batch_size=5000):
+    tags = [Tag.objects.create(name=slug, slug=slug, color=f'#00000{i}')
+            for i, slug in enumerate(TAGS)]
+    author = User.objects.create_user(username='author',
+                                      email='author@foodgram.ru')
+    Recipe.objects.bulk_create(
+        (Recipe(author=author, name=f'Рецепт {i}', text='Описание',
+                cooking_time=i % 120 + 1, image='foodgram/recipe.png')
+         for i in range(recipes_count)),
+        batch_size=batch_size
+    )
+    recipe_ids = Recipe.objects.values_list('pk', flat=True).iterator()
+    Recipe.tags.through.objects.bulk_create(
+        (Recipe.tags.through(recipe_id=recipe_id, tag_id=tags[tag].pk)
+         for position, recipe_id in enumerate(recipe_ids)
+         for tag in {position % len(tags), position * 7 % len(tags)}),
+        batch_size=batch_size
+    )
+
+
+def main():
+    options = get_parser(
+        'Compare the tag filter join+DISTINCT with the Exists subquery',
+        recipes=100_000, repeat=10
+    ).parse_args()
+    with benchmark_database():
+        seed(options.recipes)
+        rows = []
+        for slugs in (TAGS[:1], TAGS[:2], TAGS[:4]):
+            data = QueryDict(mutable=True)
+            data.setlist('tags', slugs)
+            querysets = {
+                filterset: filterset(data, Recipe.objects.all()).qs
+                for filterset in (JoinRecipeFilter, RecipeFilter)
+            }
+            join, exists = querysets.values()
+            assert (set(join.values_list('pk', flat=True))
+                    == set(exists.values_list('pk', flat=True)))
+            assert exists.count() == len(set(exists.values_list('pk',
+                                                                flat=True)))
+            for name, queryset in querysets.items():
+                rows.append((
+                    f'{len(slugs)} tag(s), {name.__name__}',
+                    measure(lambda: list(queryset[:6]), options.repeat),
+                    measure(queryset.count, options.repeat),
+                ))
+        report(f'{options.recipes} recipes, median ms: first page, count',
+               rows)
+
+
+if __name__ == '__main__':
+    main()
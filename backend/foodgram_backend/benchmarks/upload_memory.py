@@ -0,0 +1,142 @@
+import base64
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+from io import BytesIO
+from pathlib import Path
+
+from benchmarks.common import benchmark_database, get_parser, report
+from django.core.handlers.wsgi import WSGIRequest  # noqa: E402
+from django.db import transaction  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from django.test.client import (BOUNDARY, MULTIPART_CONTENT,  # noqa: E402
+                                encode_multipart)
+from PIL import Image  # noqa: E402
+from rest_framework.test import force_authenticate  # noqa: E402
+
+from api.views import RecipeViewSet  # noqa: E402
+from recipes.models import Ingredient, Tag, User  # noqa: E402
+
+RECIPE = {'name': 'Рецепт', 'text': 'Описание', 'cooking_time': 10}
+TAGS = [1]
+INGREDIENTS = [{'id': 1, 'amount': 10}]
+
+
+def read_memory_status(field):
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith(f'{field}:'):
+                return int(line.split()[1]) * 1024
+
+
+def start_peak_rss():
+    try:
+        with open('/proc/self/clear_refs', 'w') as clear_refs:
+            clear_refs.write('5')
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return lambda: (
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - peak
+        ) * (1 if sys.platform == 'darwin' else 1024)
+    current = read_memory_status('VmRSS')
+    return lambda: read_memory_status('VmHWM') - current
+
+
+def make_image(size):
+    side = int((size / 3) ** 0.5)
+    buffer = BytesIO()
+    Image.frombytes('RGB', (side, side), os.urandom(side * side * 3)).save(
+        buffer, 'PNG'
+    )
+    return buffer.getvalue()
+
+
+def encode_base64(image):
+    return 'application/json', json.dumps({
+        **RECIPE, 'tags': TAGS, 'ingredients': INGREDIENTS,
+        'image': 'data:image/png;base64,{}'.format(
+            base64.b64encode(image).decode()
+        ),
+    }).encode()
+
+
+def encode_multipart_form(image):
+    upload = BytesIO(image)
+    upload.name = 'recipe.png'
+    return MULTIPART_CONTENT, encode_multipart(BOUNDARY, {
+        **RECIPE, 'tags': json.dumps(TAGS),
+        'ingredients': json.dumps(INGREDIENTS), 'image': upload,
+    })
+
+
+ENCODERS = {'base64': encode_base64, 'multipart': encode_multipart_form}
+
+
+def upload(user, content_type, stream, length):
+    request = WSGIRequest({
+        'REQUEST_METHOD': 'POST',
+        'PATH_INFO': '/api/recipes/',
+        'SCRIPT_NAME': '',
+        'SERVER_NAME': 'testserver',
+        'SERVER_PORT': '80',
+        'CONTENT_TYPE': content_type,
+        'CONTENT_LENGTH': str(length),
+        'wsgi.input': stream,
+        'wsgi.url_scheme': 'http',
+    })
+    force_authenticate(request, user)
+    with transaction.atomic():
+        response = RecipeViewSet.as_view({'post': 'create'})(request)
+        transaction.set_rollback(True)
+    assert response.status_code == 201, response.data
+
+
+def measure_upload(mode, path):
+    with benchmark_database(), tempfile.TemporaryDirectory() as media, \
+            override_settings(MEDIA_ROOT=media):
+        user = User.objects.create_user(username='author',
+                                        email='author@foodgram.ru')
+        tag = Tag.objects.create(name='Тег', slug='tag', color='#000000')
+        ingredient = Ingredient.objects.create(name='Соль',
+                                               measurement_unit='г')
+        assert [tag.pk] == TAGS and ingredient.pk == INGREDIENTS[0]['id']
+        content_type, body = ENCODERS[mode](make_image(1024))
+        upload(user, content_type, BytesIO(body), len(body))
+        with open(path, 'rb') as stream:
+            get_peak_rss = start_peak_rss()
+            upload(user, content_type, stream, os.path.getsize(path))
+            return get_peak_rss()
+
+
+def main():
+    parser = get_parser('Peak RSS of one recipe upload, base64 JSON vs '
+                        'multipart', size_mb=8)
+    parser.add_argument('--mode', choices=ENCODERS)
+    parser.add_argument('--body')
+    options = parser.parse_args()
+    if options.mode:
+        print(measure_upload(options.mode, options.body))
+        return
+    image = make_image(options.size_mb * 2 ** 20)
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for mode, encode in ENCODERS.items():
+            path = Path(directory) / mode
+            path.write_bytes(encode(image)[1])
+            result = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.upload_memory',
+                 '--mode', mode, '--body', str(path)],
+                check=True, capture_output=True, text=True
+            )
+            rows.append((mode, len(image) / 2 ** 20,
+                         path.stat().st_size / 2 ** 20,
+                         int(result.stdout.splitlines()[-1]) / 2 ** 20))
+    report('MB: image, request body, peak RSS growth during the request',
+           rows)
+
+
+if __name__ == '__main__':
+    main()
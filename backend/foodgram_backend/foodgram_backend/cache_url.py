@@ -0,0 +1,36 @@
+from urllib.parse import parse_qsl, urlsplit
+
+from django.core.exceptions import ImproperlyConfigured
+
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'db': 'django.core.cache.backends.db.DatabaseCache',
+    'redis': 'django_redis.cache.RedisCache',
+    'rediss': 'django_redis.cache.RedisCache',
+    'dummy': 'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+def parse_cache_url(url):
+    parts = urlsplit(url)
+    if parts.scheme not in CACHE_BACKENDS:
+        raise ImproperlyConfigured(
+            f'Unsupported CACHE_URL scheme: {parts.scheme!r}'
+        )
+    config = {'BACKEND': CACHE_BACKENDS[parts.scheme]}
+    if parts.scheme.startswith('redis'):
+        config['LOCATION'] = parts._replace(query='').geturl()
+    elif parts.scheme == 'file':
+        config['LOCATION'] = parts.path
+    else:
+        config['LOCATION'] = parts.netloc or parts.path.lstrip('/')
+    options = {
+        key.upper(): int(value) if value.isdecimal() else value
+        for key, value in parse_qsl(parts.query)
+    }
+    if 'TIMEOUT' in options:
+        config['TIMEOUT'] = options.pop('TIMEOUT')
+    if options:
+        config['OPTIONS'] = options
+    return config
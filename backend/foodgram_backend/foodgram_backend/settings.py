@@ -3,6 +3,8 @@ from pathlib import Path
 
 from dotenv import load_dotenv
 
+from .cache_url import parse_cache_url
+
 load_dotenv()
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -80,6 +82,27 @@ else:
         }
     }
 
+CACHES = {
+    'default': parse_cache_url(os.getenv('CACHE_URL', 'locmem://foodgram')),
+}
+
+API_CACHE_TIMEOUT = int(os.getenv('API_CACHE_TIMEOUT', 300))
+
+FAST_SERIALIZERS = os.getenv('FAST_SERIALIZERS', 'True') == 'True'
+
+AUTH_TOKEN_CACHE_TIMEOUT = int(os.getenv('AUTH_TOKEN_CACHE_TIMEOUT', 60))
+
+REFERENCE_CACHE_TIMEOUT = int(os.getenv('REFERENCE_CACHE_TIMEOUT', 30))
+
+INGREDIENT_SEARCH_INDEX = (
+    os.getenv('INGREDIENT_SEARCH_INDEX', 'True') == 'True'
+)
+INGREDIENT_SEARCH_MODE = os.getenv('INGREDIENT_SEARCH_MODE', 'prefix')
+INGREDIENT_SEARCH_LIMIT = int(os.getenv('INGREDIENT_SEARCH_LIMIT', 50))
+INGREDIENT_SEARCH_SIMILARITY = float(
+    os.getenv('INGREDIENT_SEARCH_SIMILARITY', 0.3)
+)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -125,13 +148,23 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
 
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'api.authentication.CachedTokenAuthentication',
     ],
 
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.UserRateThrottle',
-        'rest_framework.throttling.AnonRateThrottle',
+        'api.throttling.SlidingWindowUserRateThrottle',
+        'api.throttling.SlidingWindowAnonRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'user': '10000/day',
@@ -145,4 +178,16 @@ STATIC_ROOT = BASE_DIR / 'static'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / '/media/'
 
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(
+    os.getenv('FILE_UPLOAD_MAX_MEMORY_SIZE', 2 * 1024 * 1024)
+)
+
+IMAGE_WORKERS = int(os.getenv('IMAGE_WORKERS', 2))
+
+PDF_FONT_PATH = os.getenv(
+    'PDF_FONT_PATH', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'
+)
+
+DATA_DIR = Path(os.getenv('DATA_DIR', BASE_DIR))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
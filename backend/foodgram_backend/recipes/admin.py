@@ -40,7 +40,7 @@ class RecipeAdmin(admin.ModelAdmin):
         'name',
         'author',
         'get_ingredients',
-        'recipe_count',
+        'favorites_count',
         'pub_date',
     )
     fields = ('author', 'name', 'text', 'image', 'image_preview',
@@ -50,10 +50,6 @@ class RecipeAdmin(admin.ModelAdmin):
     list_display_links = ('name',)
     inlines = (IngredientInline,)
 
-    @admin.display(description='Добавлений в избранное')
-    def recipe_count(self, obj):
-        return obj.is_fav.count()
-
     @mark_safe
     @admin.display(description='Ингредиенты')
     def get_ingredients(self, obj):
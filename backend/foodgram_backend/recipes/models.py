@@ -4,7 +4,8 @@ from django.db import models
 
 from api.const import (LENGTH_TEXT_OUTPUT, MAX_LENGTH_INPUT_NAME,
                        MAX_VALUE, MIN_VALUE)
-from users.models import FoodgramUser as User
+from .storage import ContentAddressedStorage
+from users.models import CounterFieldsMixin, FoodgramUser as User
 
 
 class Tag(models.Model):
@@ -42,7 +43,7 @@ class Ingredient(models.Model):
         return self.name[:LENGTH_TEXT_OUTPUT]
 
 
-class Recipe(models.Model):
+class Recipe(CounterFieldsMixin, models.Model):
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -51,7 +52,20 @@ class Recipe(models.Model):
     )
     name = models.CharField('Название', max_length=MAX_LENGTH_INPUT_NAME)
     text = models.TextField('Описание')
-    image = models.ImageField('Изображение блюда', upload_to='foodgram/')
+    image = models.ImageField('Изображение блюда', upload_to='foodgram/',
+                              storage=ContentAddressedStorage())
+    image_thumbnail = models.ImageField(
+        'Миниатюра', upload_to='foodgram/variants/', blank=True,
+        editable=False
+    )
+    image_card = models.ImageField(
+        'Изображение для карточки', upload_to='foodgram/variants/',
+        blank=True, editable=False
+    )
+    image_full = models.ImageField(
+        'Изображение для просмотра', upload_to='foodgram/variants/',
+        blank=True, editable=False
+    )
     ingredients = models.ManyToManyField(
         Ingredient,
         through='IngredientInRecipe',
@@ -78,11 +92,32 @@ class Recipe(models.Model):
     pub_date = models.DateTimeField(
         'Дата публикации', auto_now_add=True
     )
+    favorites_count = models.PositiveIntegerField(
+        'Добавлений в избранное', default=0, editable=False
+    )
+    in_carts_count = models.PositiveIntegerField(
+        'Добавлений в список покупок', default=0, editable=False
+    )
+    popularity = models.FloatField(
+        'Популярность', default=0, editable=False
+    )
+
+    counter_fields = ('favorites_count', 'in_carts_count', 'popularity')
 
     class Meta:
         ordering = ('-pub_date',)
         verbose_name = 'Рецепт'
         verbose_name_plural = 'Рецепты'
+        indexes = (
+            models.Index(fields=('-pub_date', '-id'),
+                         name='recipe_pub_date_id_idx'),
+            models.Index(fields=('author', '-pub_date'),
+                         name='recipe_author_pub_date_idx'),
+            models.Index(fields=('-popularity', '-pub_date'),
+                         name='recipe_popularity_idx'),
+            models.Index(fields=('cooking_time', '-pub_date'),
+                         name='recipe_cooking_time_idx'),
+        )
 
     def __str__(self):
         return self.name[:LENGTH_TEXT_OUTPUT]
@@ -172,6 +207,9 @@ class RecipeUserModel(models.Model):
         on_delete=models.CASCADE,
         verbose_name='Избранный рецепт'
     )
+    added_date = models.DateTimeField(
+        'Дата добавления', auto_now_add=True
+    )
 
     class Meta:
         abstract = True
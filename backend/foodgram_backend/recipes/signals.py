@@ -0,0 +1,105 @@
+import math
+
+from django.db import transaction
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Abs, Greatest, Log, Power
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Favourite, Follow, Recipe, ShoppingList, User
+from api.const import MIN_POPULARITY_EXPONENT, POPULARITY_HALF_LIFE
+
+COUNTERS = {
+    Favourite: (Recipe, 'recipe_id', 'favorites_count'),
+    ShoppingList: (Recipe, 'recipe_id', 'in_carts_count'),
+    Follow: (User, 'author_id', 'followers_count'),
+    Recipe: (User, 'author_id', 'recipes_count'),
+}
+
+
+def popularity_score(added_date):
+    return added_date.timestamp() / POPULARITY_HALF_LIFE
+
+
+def add_popularity(popularity, score):
+    return max(popularity, score) + math.log2(1 + 2 ** max(
+        -abs(popularity - score), MIN_POPULARITY_EXPONENT
+    ))
+
+
+def total_popularity(scores):
+    popularity = 0.0
+    for score in scores:
+        popularity = add_popularity(popularity, score)
+    return popularity
+
+
+def float_value(value):
+    return Value(value, output_field=FloatField())
+
+
+def add_popularity_expression(score):
+    return Greatest(F('popularity'), float_value(score)) + Log(
+        float_value(2), float_value(1) + Power(float_value(2), Greatest(
+            -Abs(F('popularity') - float_value(score)),
+            float_value(MIN_POPULARITY_EXPONENT)
+        ))
+    )
+
+
+def subtract_popularity_expression(score):
+    return F('popularity') + Log(
+        float_value(2), float_value(1) - Power(float_value(2), Greatest(
+            float_value(score) - F('popularity'),
+            float_value(MIN_POPULARITY_EXPONENT)
+        ))
+    )
+
+
+@transaction.atomic
+def remove_popularity(recipe_id, score):
+    recipes = Recipe.objects.filter(pk=recipe_id)
+    if recipes.filter(popularity__gt=score + 1).update(
+        popularity=subtract_popularity_expression(score)
+    ):
+        return
+    list(recipes.select_for_update().values_list('pk'))
+    recipes.update(popularity=total_popularity(
+        popularity_score(added_date)
+        for added_date in Favourite.objects.filter(
+            recipe_id=recipe_id
+        ).order_by('added_date').values_list('added_date', flat=True)
+    ))
+
+
+def update_counter(sender, instance, delta):
+    model, attname, field = COUNTERS[sender]
+    queryset = model.objects.filter(pk=getattr(instance, attname))
+    if delta < 0:
+        queryset = queryset.filter(**{f'{field}__gte': -delta})
+    updates = {field: F(field) + delta}
+    if sender is Favourite and delta > 0:
+        updates['popularity'] = add_popularity_expression(
+            popularity_score(instance.added_date)
+        )
+    queryset.update(**updates)
+    if sender is Favourite and delta < 0:
+        remove_popularity(instance.recipe_id,
+                          popularity_score(instance.added_date))
+
+
+@receiver(post_save, sender=Favourite)
+@receiver(post_save, sender=ShoppingList)
+@receiver(post_save, sender=Follow)
+@receiver(post_save, sender=Recipe)
+def increment_counter(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        update_counter(sender, instance, 1)
+
+
+@receiver(post_delete, sender=Favourite)
+@receiver(post_delete, sender=ShoppingList)
+@receiver(post_delete, sender=Follow)
+@receiver(post_delete, sender=Recipe)
+def decrement_counter(sender, instance, **kwargs):
+    update_counter(sender, instance, -1)
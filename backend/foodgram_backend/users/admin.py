@@ -10,17 +10,9 @@ class UserAdmin(BaseUserAdmin):
         'id',
         'username',
         'email',
-        'recipe_count',
-        'follower_count'
+        'recipes_count',
+        'followers_count'
     )
     list_filter = ('username', 'email')
     search_fields = ('username', 'email')
     list_display_links = ('username',)
-
-    @admin.display(description='Кол-во рецептов')
-    def recipe_count(self, obj):
-        return obj.recipes.count()
-
-    @admin.display(description='Кол-во подписчиков')
-    def follower_count(self, obj):
-        return obj.author.count()
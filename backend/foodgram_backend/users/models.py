@@ -5,19 +5,48 @@ from api.const import (LENGTH_TEXT_OUTPUT, MAX_LENGTH_INPUT,
                        MAX_LENGTH_INPUT_EMAIL)
 
 
-class FoodgramUser(AbstractUser):
+class CounterFieldsMixin:
+    counter_fields = ()
+
+    def save(self, *args, update_fields=None, **kwargs):
+        if update_fields is None and not self._state.adding:
+            deferred_fields = self.get_deferred_fields()
+            update_fields = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname not in deferred_fields
+                and field.name not in self.counter_fields
+            ]
+        super().save(*args, update_fields=update_fields, **kwargs)
+
+
+class FoodgramUser(CounterFieldsMixin, AbstractUser):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ('username', 'first_name', 'last_name')
+    counter_fields = ('recipes_count', 'followers_count')
 
     first_name = models.CharField('Имя', max_length=MAX_LENGTH_INPUT)
     last_name = models.CharField('Фамилия', max_length=MAX_LENGTH_INPUT)
     email = models.EmailField('email', max_length=MAX_LENGTH_INPUT_EMAIL,
                               unique=True)
+    recipes_count = models.PositiveIntegerField(
+        'Кол-во рецептов', default=0, editable=False
+    )
+    followers_count = models.PositiveIntegerField(
+        'Кол-во подписчиков', default=0, editable=False
+    )
 
     class Meta:
         ordering = ('username',)
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
 
+    def refresh_from_db(self, using=None, fields=None):
+        if fields is not None:
+            deferred_fields = self.get_deferred_fields()
+            if deferred_fields.intersection(fields):
+                fields = deferred_fields.union(fields)
+        super().refresh_from_db(using, fields)
+
     def __str__(self):
         return self.username[:LENGTH_TEXT_OUTPUT]